@@ -1,113 +1,192 @@
 # app.py
+import html
+import time
+
 import streamlit as st
-from corpus_data import corpus_data, image_urls
-
-st.set_page_config(page_title="LitArc", layout="wide")
-
-st.markdown("""
-    <style>
-    .decorative-title {
-        text-align: center;
-        font-family: 'Georgia', serif;
-        font-size: 4.2em;
-        font-weight: 700;
-        letter-spacing: 2px;
-        margin-bottom: 40px;
-        color: #111;
-    }
-    .decorative-title span.lit {
-        color: #8B0000;
-        text-shadow: 1px 1px 2px rgba(139, 0, 0, 0.3);
-    }
-    .decorative-title span.arc {
-        color: #696969;
-        text-shadow: 1px 1px 2px rgba(105, 105, 105, 0.3);
-    }
-    .center-container {
-        display: flex;
-        justify-content: center;
-        flex-wrap: wrap;
-        gap: 20px;
-        margin-bottom: 40px;
-    }
-    .link-card {
-        width: 320px;
-        padding: 25px;
-        border-radius: 16px;
-        background-color: #f2f2f2;
-        border: 2px solid #c0392b;
-        box-shadow: 0 4px 12px rgba(192, 57, 43, 0.1);
-        transition: transform 0.2s ease-in-out, box-shadow 0.3s ease;
-        cursor: pointer;
-        min-height: auto;  
-        display: flex;
-        flex-direction: column;
-        justify-content: flex-start;
-    }
-    .link-card:hover {
-        transform: translateY(-4px) scale(1.03);
-        box-shadow: 0 8px 20px rgba(192, 57, 43, 0.3);
-        background-color: #f9e6e6;
-    }
-    .link-img {
-        width: 100px;
-        height: 100px;
-        object-fit: cover;
-        border-radius: 12px;
-        margin-bottom: 12px;
-        display: block;
-        margin-left: auto;
-        margin-right: auto;
-    }
-    .link-name {
-        font-family: 'Georgia', serif;
-        color: #922b21;
-        font-size: 1.2em;
-        font-weight: 600;
-        text-align: center;
-        margin-bottom: 10px;
-    }
-    .description-text {
-        font-family: 'Georgia', serif;
-        color: #555555;
-        font-size: 1em;
-        text-align: justify;
-        line-height: 1.4em;
-        /* Remove min-height */
-        min-height: auto; 
-        /* Prevent truncation */
-        overflow: visible;
-        white-space: normal;
-    }
-    .card-wrapper {
-        display: flex;
-        justify-content: center;
-        margin: 0 15px 20px 15px;
-    }
-    a {
-        text-decoration: none !important;
-    }
-    </style>
-
-    <div class="decorative-title">
-        <span class="lit">Lit</span><span class="arc">Arc</span>
-    </div>
-""", unsafe_allow_html=True)
-
-cards_per_row = 4
-
-for i in range(0, len(corpus_data), cards_per_row):
-    cols = st.columns(cards_per_row)
-    for j, (name, short, desc) in enumerate(corpus_data[i:i+cards_per_row]):
-        with cols[j]:
-            link = f"/{short}"  # Page path for routing
-            img_url = image_urls.get(short, "https://via.placeholder.com/100?text=No+Image")
-            st.markdown(f"""
-            <a href="{link}" target="_self">
-                <div class="link-card">
-                    <img src="{img_url}" class="link-img"/>
-                    <div class="link-name">{name}</div>
-                    <div class="description-text">{desc}</div>
-                </div>
-            </a>
-            """, unsafe_allow_html=True)
+import corpus_page
+import corpus_store
+import home_cards
+import perf
+import perf_page
+import search_index
+from corpus_data import corpus_data
+
+SEARCH_CSS = """
+<style>
+.search-results {
+    font-family: Georgia, serif;
+    border-collapse: collapse;
+    width: 100%;
+    margin-bottom: 10px;
+    box-shadow: 0 0 12px rgba(0,0,0,0.1);
+    border-radius: 12px;
+    overflow: hidden;
+}
+.search-results th {
+    background-color: #8B0000;
+    color: white;
+    font-weight: 700;
+    padding: 10px 14px;
+    text-align: left;
+}
+.search-results td {
+    border-bottom: 1px solid #eee;
+    padding: 8px 14px;
+}
+.search-results tr:nth-child(even) {
+    background-color: #f9f9f9;
+}
+</style>
+"""
+
+corpus_names = {short: name for name, short, _ in corpus_data}
+
+HOME_CSS = """
+<style>
+.decorative-title {
+    text-align: center;
+    font-family: 'Georgia', serif;
+    font-size: 4.2em;
+    font-weight: 700;
+    letter-spacing: 2px;
+    margin-bottom: 40px;
+    color: #111;
+}
+.decorative-title span.lit {
+    color: #8B0000;
+    text-shadow: 1px 1px 2px rgba(139, 0, 0, 0.3);
+}
+.decorative-title span.arc {
+    color: #696969;
+    text-shadow: 1px 1px 2px rgba(105, 105, 105, 0.3);
+}
+.card-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(260px, 1fr));
+    gap: 20px 30px;
+    margin-bottom: 40px;
+}
+.link-card {
+    height: 100%;
+    box-sizing: border-box;
+    padding: 25px;
+    border-radius: 16px;
+    background-color: #f2f2f2;
+    border: 2px solid #c0392b;
+    box-shadow: 0 4px 12px rgba(192, 57, 43, 0.1);
+    transition: transform 0.2s ease-in-out, box-shadow 0.3s ease;
+    cursor: pointer;
+    min-height: auto;  
+    display: flex;
+    flex-direction: column;
+    justify-content: flex-start;
+}
+.link-card:hover {
+    transform: translateY(-4px) scale(1.03);
+    box-shadow: 0 8px 20px rgba(192, 57, 43, 0.3);
+    background-color: #f9e6e6;
+}
+.link-img {
+    width: 100px;
+    height: 100px;
+    object-fit: cover;
+    border-radius: 12px;
+    margin-bottom: 12px;
+    display: block;
+    margin-left: auto;
+    margin-right: auto;
+}
+.link-card picture {
+    display: block;
+}
+.link-name {
+    font-family: 'Georgia', serif;
+    color: #922b21;
+    font-size: 1.2em;
+    font-weight: 600;
+    text-align: center;
+    margin-bottom: 10px;
+}
+.description-text {
+    font-family: 'Georgia', serif;
+    color: #555555;
+    font-size: 1em;
+    text-align: justify;
+    line-height: 1.4em;
+    /* Remove min-height */
+    min-height: auto; 
+    /* Prevent truncation */
+    overflow: visible;
+    white-space: normal;
+}
+a {
+    text-decoration: none !important;
+}
+</style>
+"""
+
+def play_search():
+    query = st.text_input(
+        "Search plays",
+        placeholder="Search all corpora by title, subtitle or author",
+        label_visibility="collapsed",
+    )
+    if not query:
+        return
+
+    # Index whatever metadata is already loaded; corpora still warming up
+    # are picked up on a later search.
+    for short in corpus_names:
+        df = corpus_store.cached_metadata(short)
+        if df is not None:
+            search_index.index.sync(short, df)
+
+    start = time.perf_counter()
+    results = search_index.index.search(query)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    indexed = len(search_index.index.corpora())
+    note = f" ({indexed} of {len(corpus_names)} corpora indexed so far)" if indexed < len(corpus_names) else ""
+    st.caption(f"{len(results)} plays found in {elapsed_ms:.1f} ms{note}")
+    if not results:
+        return
+
+    table_html = "<table class='search-results'>"
+    table_html += "<tr><th>Title</th><th>Subtitle</th><th>Author</th><th>Year</th><th>Corpus</th></tr>"
+    for r in results:
+        cells = [r["title"], r["subtitle"], r["author"], r["year"]]
+        table_html += "<tr>" + "".join(f"<td>{'' if v is None else html.escape(str(v))}</td>" for v in cells)
+        table_html += f"<td><a href='/{r['corpus']}' target='_self'>{html.escape(corpus_names[r['corpus']])}</a></td></tr>"
+    table_html += "</table>"
+    st.markdown(SEARCH_CSS + table_html, unsafe_allow_html=True)
+
+
+def home():
+    st.markdown(HOME_CSS + """
+        <div class="decorative-title">
+            <span class="lit">Lit</span><span class="arc">Arc</span>
+        </div>
+    """, unsafe_allow_html=True)
+
+    play_search()
+
+    st.markdown(home_cards.grid(), unsafe_allow_html=True)
+
+
+def corpus_route(name, short):
+    def page():
+        corpus_page.render(short)
+    page.__name__ = short
+    return st.Page(page, title=name, url_path=short)
+
+
+corpus_store.start_warmup([short for _, short, _ in corpus_data])
+perf.start_metrics_server()
+
+pg = st.navigation(
+    [st.Page(home, title="LitArc", default=True)]
+    + [corpus_route(name, short) for name, short, _ in corpus_data]
+    + ([st.Page(perf_page.render, title="Performance", url_path="performance")] if perf_page.ENABLED else [])
+)
+st.set_page_config(page_title=pg.title, layout="centered" if pg.url_path in corpus_page.corpora else "wide")
+pg.run()
@@ -0,0 +1,64 @@
+# benchmarks/fixtures.py
+# Recorded DraCor responses, stored on disk under benchmarks/recorded/ by API
+# path, e.g. corpora/fre/metadata/csv -> recorded/corpora/fre/metadata/csv.fixture
+# and corpora?include=metrics -> recorded/corpora@include=metrics.fixture
+import csv
+import io
+import os
+
+import dracor_client
+
+RECORDED_DIR = os.environ.get(
+    "LITARC_FIXTURES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "recorded")
+)
+
+METRICS_PATH = "corpora?include=metrics"
+
+
+def metadata_path(corpus_code):
+    return f"corpora/{corpus_code}/metadata/csv"
+
+
+def fixture_file(path, root=None):
+    route, _, query = path.partition("?")
+    name = os.path.join(root or RECORDED_DIR, *route.strip("/").split("/"))
+    if query:
+        name += "@" + query
+    return name + ".fixture"
+
+
+def has(path, root=None):
+    return os.path.exists(fixture_file(path, root))
+
+
+def load(path, root=None):
+    with open(fixture_file(path, root), "rb") as f:
+        return f.read()
+
+
+def save(path, body, root=None):
+    target = fixture_file(path, root)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(body)
+
+
+def play_paths(corpus_code, play_name):
+    return [f"corpora/{corpus_code}/plays/{play_name}", f"corpora/{corpus_code}/plays/{play_name}/metrics"]
+
+
+def play_names(metadata_body):
+    return [row["name"] for row in csv.DictReader(io.StringIO(metadata_body.decode("utf-8-sig")))]
+
+
+def record(corpus_codes, root=None, plays=False):
+    # Download the live responses once so benchmarks can run offline.
+    save(METRICS_PATH, dracor_client.fetch(METRICS_PATH).body, root)
+    for code in corpus_codes:
+        body = dracor_client.fetch(metadata_path(code)).body
+        save(metadata_path(code), body, root)
+        save(f"corpora/{code}", dracor_client.fetch(f"corpora/{code}").body, root)
+        if plays:
+            for play in play_names(body):
+                for path in play_paths(code, play):
+                    save(path, dracor_client.fetch(path).body, root)
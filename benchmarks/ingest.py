@@ -0,0 +1,89 @@
+# benchmarks/ingest.py
+# Metadata ingest: the original path (decode the whole CSV into a str, parse
+# every column with inferred dtypes, cache the full frame) against
+# corpus_store.parse_metadata, on recorded fixtures.
+#
+#   python -m benchmarks.ingest --record          # once, needs network
+#   python -m benchmarks.ingest [--corpus fre] [--repeat 7] [--json report.json]
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+import corpus_store
+from benchmarks import fixtures
+from corpus_data import corpus_data
+
+
+def legacy_ingest(body):
+    return pd.read_csv(io.StringIO(body.decode("utf-8")))
+
+
+def typed_ingest(body):
+    return corpus_store.parse_metadata(body)
+
+
+def _time(fn, body, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = fn(body)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs), int(df.memory_usage(deep=True).sum()), len(df)
+
+
+def run(corpus_codes, repeat):
+    results = []
+    for code in corpus_codes:
+        path = fixtures.metadata_path(code)
+        if not fixtures.has(path):
+            print(f"{code}: no fixture, skipped (run with --record)", file=sys.stderr)
+            continue
+        body = fixtures.load(path)
+        legacy_s, legacy_bytes, rows = _time(legacy_ingest, body, repeat)
+        typed_s, typed_bytes, _ = _time(typed_ingest, body, repeat)
+        results.append({
+            "corpus": code,
+            "rows": rows,
+            "csv_bytes": len(body),
+            "legacy_seconds": legacy_s,
+            "typed_seconds": typed_s,
+            "legacy_frame_bytes": legacy_bytes,
+            "typed_frame_bytes": typed_bytes,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark metadata CSV ingest.")
+    parser.add_argument("--corpus", action="append", help="corpora to run (default: all in corpus_data)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--record", action="store_true", help="download fixtures from DraCor first")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    codes = args.corpus or [short for _, short, _ in corpus_data]
+    if args.record:
+        fixtures.record(codes)
+
+    results = run(codes, args.repeat)
+    print(f"{'corpus':<8}{'rows':>7}{'legacy ms':>11}{'typed ms':>10}{'speedup':>9}{'legacy KiB':>12}{'typed KiB':>11}{'smaller':>9}")
+    for r in results:
+        print(
+            f"{r['corpus']:<8}{r['rows']:>7}"
+            f"{r['legacy_seconds'] * 1000:>11.2f}{r['typed_seconds'] * 1000:>10.2f}"
+            f"{r['legacy_seconds'] / r['typed_seconds']:>8.1f}x"
+            f"{r['legacy_frame_bytes'] / 1024:>12.0f}{r['typed_frame_bytes'] / 1024:>11.0f}"
+            f"{r['legacy_frame_bytes'] / r['typed_frame_bytes']:>8.1f}x"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# benchmarks/pipeline.py
+# The stages a corpus page runs after the metadata bytes arrive, as separate
+# steps that can be timed one by one. Each stage reads and extends `state`.
+import time
+import tracemalloc
+
+import corpus_page
+import corpus_store
+
+
+def _parse(state):
+    state["df_meta"] = corpus_store.parse_metadata(state["body"])
+
+
+def _stats(state):
+    state["stats"] = corpus_page.stats_from_metadata(state["df_meta"])
+
+
+def _prepare(state):
+    state["df_show"] = corpus_page.prepare_catalogue(state["df_meta"])
+
+
+def _catalogue_page(state):
+    state["rows"] = corpus_page.catalogue_page(state["df_show"], sort_by="Author", page_size=50)[0]
+
+
+def _catalogue_html(state):
+    state["html"] = corpus_page.catalogue_html(state["rows"])
+
+
+def _full_html(state):
+    # The pre-pagination catalogue: every row through to_html
+    state["full_html"] = state["df_show"].to_html(index=False, escape=False)
+
+
+def _groupby(state):
+    state["counts"] = corpus_page.author_counts(state["df_show"], corpus_page.TOP_AUTHORS[0])
+
+
+def _figure(state):
+    state["fig"] = corpus_page.author_figure(state["counts"])
+
+
+def _serialize(state):
+    state["fig_json"] = state["fig"].to_json()
+
+
+STAGES = [
+    ("parse", _parse),
+    ("stats", _stats),
+    ("prepare", _prepare),
+    ("catalogue_page", _catalogue_page),
+    ("catalogue_html", _catalogue_html),
+    ("full_html", _full_html),
+    ("groupby", _groupby),
+    ("figure", _figure),
+    ("serialize", _serialize),
+]
+
+
+def measure(fn, state, trace_memory=False):
+    # Wall time of one call; with trace_memory, the peak Python heap it used
+    # (traced separately, since tracing slows the call down).
+    start = time.perf_counter()
+    fn(state)
+    seconds = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            fn(state)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
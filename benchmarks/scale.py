@@ -0,0 +1,42 @@
+# benchmarks/scale.py
+# How each page stage scales with corpus size, on synthetic corpora.
+#
+#   python -m benchmarks.scale [--sizes 1000 10000 100000 1000000] [--skip full_html] [--json report.json]
+import argparse
+import json
+import sys
+
+from benchmarks import pipeline, synth
+
+
+def run(sizes, skip=(), trace_memory=True, seed=0):
+    results = []
+    for n in sizes:
+        state = {"body": synth.csv_bytes(synth.metadata_frame(n, f"synth{n}", seed))}
+        row = {"plays": n, "csv_bytes": len(state["body"]), "stages": {}}
+        for name, fn in pipeline.STAGES:
+            if name in skip:
+                continue
+            seconds, peak = pipeline.measure(fn, state, trace_memory)
+            row["stages"][name] = {"seconds": seconds, "peak_bytes": peak}
+            print(f"{n:>9,} {name:<16}{seconds * 1000:>11.1f} ms" + (f"{peak / 2**20:>10.1f} MiB" if peak is not None else ""))
+        results.append(row)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the corpus page stages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip", nargs="*", default=[], help="stages to leave out, e.g. full_html")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory pass")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, set(args.skip), not args.no_memory)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# benchmarks/stages.py
+# Per-stage timings of every corpus page against recorded fixtures, served by
+# an in-process stand-in, in cold-cache and warm-cache mode.
+#
+#   python -m benchmarks.stages [--corpus fre] [--repeat 5] [--json report.json]
+#   python -m benchmarks.stages --json new.json --compare baseline.json
+#
+# cold: empty disk, shared and memory caches, so the CSV comes over HTTP and
+#       is parsed again.
+# warm: metadata is a memory-cache hit; the rest of the page runs.
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import corpus_store
+import dracor_client
+import http_cache
+import shared_cache
+import snapshot
+from benchmarks import fixtures, pipeline, standin
+from corpus_data import corpus_data
+
+# Stages after the metadata frame exists, shared by both modes
+PAGE_STAGES = [(name, fn) for name, fn in pipeline.STAGES if name != "parse"]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def cold_run(code):
+    corpus_store.clear()
+    http_cache.clear()
+    shared_cache.clear()
+    timings = {}
+    timings["csv_fetch"], body = _timed(lambda: dracor_client.fetch(fixtures.metadata_path(code)).body)
+    state = {"body": body}
+    timings["parse"], _ = pipeline.measure(pipeline._parse, state)
+    for name, fn in PAGE_STAGES:
+        timings[name], _ = pipeline.measure(fn, state)
+    return timings
+
+
+def warm_run(code):
+    timings = {}
+    timings["metadata_cache"], df = _timed(lambda: corpus_store.metadata(code))
+    state = {"df_meta": df}
+    for name, fn in PAGE_STAGES:
+        timings[name], _ = pipeline.measure(fn, state)
+    return timings
+
+
+def run(codes, repeat, skip=()):
+    results = []
+    for code in codes:
+        for mode, runner in (("cold", cold_run), ("warm", warm_run)):
+            if mode == "warm":
+                corpus_store.metadata(code)
+            runs = {}
+            for _ in range(repeat):
+                for stage, seconds in runner(code).items():
+                    runs.setdefault(stage, []).append(seconds)
+            for stage, samples in runs.items():
+                if stage in skip:
+                    continue
+                results.append({
+                    "corpus": code,
+                    "mode": mode,
+                    "stage": stage,
+                    "median_seconds": statistics.median(samples),
+                    "min_seconds": min(samples),
+                    "max_seconds": max(samples),
+                    "runs": len(samples),
+                })
+    return results
+
+
+def compare(results, baseline, threshold):
+    base = {(r["corpus"], r["mode"], r["stage"]): r["median_seconds"] for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        before = base.get((r["corpus"], r["mode"], r["stage"]))
+        # Ignore sub-millisecond stages, where noise dominates
+        if before and r["median_seconds"] > 0.001 and r["median_seconds"] > before * (1 + threshold):
+            regressions.append(dict(r, baseline_seconds=before, change=r["median_seconds"] / before - 1))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every corpus page stage, cold and warm.")
+    parser.add_argument("--corpus", action="append", help="corpora to run (default: all with fixtures)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip", nargs="*", default=[], help="stages to leave out of the report")
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in latency per response")
+    parser.add_argument("--bandwidth", type=float, default=None, help="stand-in bytes per second")
+    parser.add_argument("--json", help="write the machine-readable report here")
+    parser.add_argument("--compare", help="baseline report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    codes = args.corpus or [short for _, short, _ in corpus_data]
+    missing = [code for code in codes if not fixtures.has(fixtures.metadata_path(code))]
+    if missing:
+        print(f"No fixtures for {', '.join(missing)}; skipped (record them with python -m benchmarks.standin record)", file=sys.stderr)
+    codes = [code for code in codes if code not in missing]
+    if not codes:
+        print("Nothing to benchmark: fixtures missing.", file=sys.stderr)
+        return 1
+
+    # Isolate from the developer's caches and snapshot
+    scratch = tempfile.mkdtemp(prefix="litarc-bench-")
+    http_cache.CACHE_DIR = scratch
+    http_cache.DB_PATH = os.path.join(scratch, "http.sqlite")
+    shared_cache.SHARED_DIR = os.path.join(scratch, "shared")
+    snapshot.SNAPSHOT_DIR = os.path.join(scratch, "snapshot")
+    corpus_store.DATA_MODE = "live"
+    server = standin.start(latency=args.latency, bandwidth=args.bandwidth)
+    dracor_client.API_BASE = server.api_base
+
+    results = run(codes, args.repeat, set(args.skip))
+    server.shutdown()
+
+    for r in results:
+        print(f"{r['corpus']:<8}{r['mode']:<6}{r['stage']:<16}{r['median_seconds'] * 1000:>10.2f} ms")
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "repeat": args.repeat,
+            "latency": args.latency,
+            "bandwidth": args.bandwidth,
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['corpus']} {r['mode']} {r['stage']}: "
+                  f"{r['baseline_seconds'] * 1000:.2f} -> {r['median_seconds'] * 1000:.2f} ms (+{r['change']:.0%})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
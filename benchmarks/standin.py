@@ -0,0 +1,141 @@
+# benchmarks/standin.py
+# Local DraCor stand-in: replays the recorded fixtures under the same URL
+# layout as https://dracor.org/api/v1/, with knobs for latency, bandwidth
+# and failure rate so pages can be benchmarked on an air-gapped box.
+#
+#   python -m benchmarks.standin record [--plays]        # once, needs network
+#   python -m benchmarks.standin serve --port 8088 --latency 0.05 --bandwidth 2e6 --failure-rate 0.01
+#   DRACOR_API_BASE=http://127.0.0.1:8088/api/v1/ streamlit run app.py
+import argparse
+import hashlib
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks import fixtures
+
+API_PREFIX = "/api/v1/"
+CHUNK = 16 * 1024
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, root=None, latency=0.0, jitter=0.0, bandwidth=None, failure_rate=0.0, seed=None):
+        super().__init__(address, StandinHandler)
+        self.root = root
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.hits = {}
+        self.hits_lock = threading.Lock()
+
+    @property
+    def api_base(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def roll(self):
+        with self.random_lock:
+            return self.random.random(), self.random.uniform(-self.jitter, self.jitter)
+
+    def count(self, path):
+        with self.hits_lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if not self.path.startswith(API_PREFIX):
+            return self._send(404, b'{"error": "not found"}')
+        path = self.path[len(API_PREFIX):]
+        server.count(path)
+
+        failure, jitter = server.roll()
+        time.sleep(max(0.0, server.latency + jitter))
+        if failure < server.failure_rate:
+            return self._send(503, b'{"error": "injected failure"}')
+        if not fixtures.has(path, server.root):
+            return self._send(404, b'{"error": "no fixture recorded"}')
+
+        body = fixtures.load(path, server.root)
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", etag=etag)
+        content_type = "text/csv; charset=utf-8" if path.endswith("/csv") else "application/json"
+        self._send(200, body, content_type=content_type, etag=etag)
+
+    def _send(self, status, body, content_type="application/json", etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        bandwidth = self.server.bandwidth
+        for i in range(0, len(body), CHUNK):
+            chunk = body[i:i + CHUNK]
+            self.wfile.write(chunk)
+            if bandwidth:
+                time.sleep(len(chunk) / bandwidth)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(port=0, **knobs):
+    # Serve in a background thread; returns the server (see .api_base, .hits).
+    server = StandinServer(("127.0.0.1", port), **knobs)
+    threading.Thread(target=server.serve_forever, name="dracor-standin", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    from corpus_data import corpus_data
+
+    parser = argparse.ArgumentParser(description="Local DraCor stand-in server.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record fixtures from the live API")
+    rec.add_argument("--corpus", action="append", help="corpora to record (default: all in corpus_data)")
+    rec.add_argument("--plays", action="store_true", help="also record the per-play endpoints")
+    rec.add_argument("--root", help=f"directory to record into (default: {fixtures.RECORDED_DIR})")
+    serve = sub.add_parser("serve", help="replay the recorded fixtures")
+    serve.add_argument("--port", type=int, default=8088)
+    serve.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of random extra latency")
+    serve.add_argument("--bandwidth", type=float, default=None, help="bytes per second per response")
+    serve.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered with 503")
+    serve.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        fixtures.record(args.corpus or [short for _, short, _ in corpus_data], root=args.root, plays=args.plays)
+        print(f"Fixtures recorded under {args.root or fixtures.RECORDED_DIR}")
+        return
+
+    server = StandinServer(
+        ("127.0.0.1", args.port),
+        latency=args.latency,
+        jitter=args.jitter,
+        bandwidth=args.bandwidth,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    print(f"Serving {fixtures.RECORDED_DIR} at {server.api_base}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# benchmarks/stats_check.py
+# Cross-check the "Corpus Statistics" table the pages derive from metadata
+# against the figures DraCor reports in corpora?include=metrics.
+#
+#   python -m benchmarks.stats_check [--corpus fre] [--tolerance 0.01]
+#
+# Talks to DRACOR_API_BASE, so it runs against the stand-in as well.
+# Exits 1 when a figure differs by more than the tolerance.
+import argparse
+import sys
+
+import corpus_page
+import corpus_store
+from corpus_data import corpus_data
+
+# Segment counts are not in the metadata; the pages take them from the metrics
+NOT_DERIVED = {"Spoken Segments", "Stage Directions"}
+
+
+def compare(derived, reported, tolerance):
+    mismatches = []
+    for key, expected in reported.items():
+        if key in NOT_DERIVED or expected is None:
+            continue
+        actual = derived.get(key)
+        if actual is None or abs(actual - expected) > tolerance * max(abs(expected), 1):
+            mismatches.append((key, actual, expected))
+    return mismatches
+
+
+def check(df, metrics, tolerance=0.0):
+    # Mismatches between the table derived from a metadata frame and the
+    # corpus's entry in corpora?include=metrics
+    reported = corpus_page.stats_from_metrics(metrics)
+    if "wordcount" not in metrics:
+        reported.pop("Total Word Count")  # would read as 0
+    return compare(corpus_page.stats_from_metadata(df), reported, tolerance)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare metadata-derived corpus statistics with the API metrics.")
+    parser.add_argument("--corpus", action="append", help="corpora to check (default: all in corpus_data)")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="allowed relative difference")
+    args = parser.parse_args(argv)
+
+    index = corpus_store.fetch_metrics_index()
+    failed = False
+    for code in args.corpus or [short for _, short, _ in corpus_data]:
+        if code not in index:
+            print(f"{code:<10}no metrics reported, skipped")
+            continue
+        try:
+            df = corpus_store.fetch_metadata(code)
+        except Exception as exc:
+            print(f"{code:<10}metadata unavailable: {exc}")
+            failed = True
+            continue
+        mismatches = check(df, index[code].get("metrics", {}), args.tolerance)
+        print(f"{code:<10}{'ok' if not mismatches else 'MISMATCH'}")
+        for key, actual, expected in mismatches:
+            print(f"{'':<10}{key}: derived {actual}, reported {expected}")
+        failed |= bool(mismatches)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# benchmarks/synth.py
+# Synthetic DraCor-compatible corpora for scale testing: a metadata CSV with
+# the columns the API returns and a Zipf-distributed author population,
+# plus a matching corpora?include=metrics entry.
+#
+#   python -m benchmarks.synth --plays 100000 --name synth100k
+#
+# writes the fixtures the stand-in server replays (see benchmarks/fixtures.py).
+import argparse
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import fixtures
+
+_WORDS = (
+    "love death king queen night dream fool wife husband daughter son court war peace "
+    "honour revenge fortune father mother prince miser widow lover soldier merchant "
+    "doctor house garden winter summer storm wedding trial ghost crown world village"
+).split()
+_SUBTITLES = ["", "A Tragedy", "A Comedy", "Ein Trauerspiel", "Ein Lustspiel", "Comédie en cinq actes", "Drame"]
+_GENRES = ["", "Tragedy", "Comedy", "Libretto", "Tragicomedy"]
+
+
+def zipf_authors(n_plays, rng, exponent=1.1):
+    # Rank-frequency Zipf: a few prolific authors, a long tail of one-play authors
+    n_authors = max(10, n_plays // 4)
+    weights = 1.0 / np.arange(1, n_authors + 1) ** exponent
+    weights /= weights.sum()
+    ranks = rng.choice(n_authors, size=n_plays, p=weights)
+    return np.char.add("Author ", ranks.astype(str))
+
+
+def metadata_frame(n_plays, name="synth", seed=0):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(n_plays)
+    words = np.array(_WORDS)
+    title_words = words[rng.integers(0, len(words), size=(n_plays, 3))]
+    titles = [" ".join(t).capitalize() for t in title_words]
+
+    male = rng.integers(1, 30, n_plays)
+    female = rng.integers(0, 15, n_plays)
+    unknown = rng.integers(0, 3, n_plays)
+    word_sp = rng.integers(2_000, 40_000, n_plays)
+    word_stage = (word_sp * rng.uniform(0.02, 0.15, n_plays)).astype(int)
+    year = rng.integers(1550, 1940, n_plays).astype(float)
+    year[rng.random(n_plays) < 0.1] = np.nan
+
+    def years(values):
+        # Nullable ints, so the CSV says 1562 (not 1562.0) like the API does
+        return pd.array(values, dtype="Int16")
+
+    return pd.DataFrame({
+        "name": np.char.add(f"{name}-", ids.astype(str)),
+        "id": np.char.add(f"{name}0", ids.astype(str)),
+        "firstAuthor": zipf_authors(n_plays, rng),
+        "numOfCoAuthors": (rng.random(n_plays) < 0.05).astype(int),
+        "title": titles,
+        "subtitle": np.array(_SUBTITLES)[rng.integers(0, len(_SUBTITLES), n_plays)],
+        "normalizedGenre": np.array(_GENRES)[rng.integers(0, len(_GENRES), n_plays)],
+        "yearWritten": years(year - rng.integers(0, 5, n_plays)),
+        "yearPrinted": years(year),
+        "yearPremiered": years(year + rng.integers(0, 3, n_plays)),
+        "yearNormalized": years(year),
+        "size": male + female + unknown,
+        "numOfSpeakers": male + female + unknown,
+        "numOfSpeakersMale": male,
+        "numOfSpeakersFemale": female,
+        "numOfSpeakersUnknown": unknown,
+        "numOfPersonGroups": rng.integers(0, 4, n_plays),
+        "numOfSegments": rng.integers(5, 80, n_plays),
+        "numOfActs": rng.integers(1, 6, n_plays),
+        "wordCountText": word_sp + word_stage,
+        "wordCountSp": word_sp,
+        "wordCountStage": word_stage,
+        "averageDegree": rng.uniform(2, 12, n_plays).round(3),
+        "density": rng.uniform(0.1, 1, n_plays).round(3),
+        "wikidataId": "",
+    })
+
+
+def metrics_entry(df, name):
+    return {
+        "name": name,
+        "title": f"Synthetic corpus ({len(df):,} plays)",
+        "metrics": {
+            "plays": len(df),
+            "characters": int(df["numOfSpeakers"].sum()),
+            "male": int(df["numOfSpeakersMale"].sum()),
+            "female": int(df["numOfSpeakersFemale"].sum()),
+            "sp": int(df["numOfSegments"].sum() * 20),
+            "stage": int(df["numOfSegments"].sum() * 4),
+            "wordcount": {
+                "text": int(df["wordCountText"].sum()),
+                "sp": int(df["wordCountSp"].sum()),
+                "stage": int(df["wordCountStage"].sum()),
+            },
+        },
+    }
+
+
+def csv_bytes(df):
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def write(n_plays, name, seed=0, root=None):
+    df = metadata_frame(n_plays, name, seed)
+    fixtures.save(fixtures.metadata_path(name), csv_bytes(df), root)
+
+    # Merge into the recorded metrics index rather than replacing it
+    corpora = json.loads(fixtures.load(fixtures.METRICS_PATH, root)) if fixtures.has(fixtures.METRICS_PATH, root) else []
+    corpora = [c for c in corpora if c.get("name") != name] + [metrics_entry(df, name)]
+    fixtures.save(fixtures.METRICS_PATH, json.dumps(corpora).encode("utf-8"), root)
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic DraCor corpus as fixtures.")
+    parser.add_argument("--plays", type=int, required=True)
+    parser.add_argument("--name", help="corpus name (default: synth<plays>)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    name = args.name or f"synth{args.plays}"
+    df = write(args.plays, name, args.seed)
+    print(f"{name}: {len(df):,} plays by {df['firstAuthor'].nunique():,} authors -> {fixtures.fixture_file(fixtures.metadata_path(name))}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
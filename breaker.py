@@ -0,0 +1,49 @@
+# breaker.py
+# Circuit breaker: after enough consecutive failures (errors, or calls over
+# the latency budget) calls are refused outright for a while, then a single
+# probe call decides whether to close again or stay open.
+import threading
+import time
+
+
+class CircuitBreaker:
+    def __init__(self, failures=5, latency_budget=None, reset_after=30):
+        self.failures = failures
+        self.latency_budget = latency_budget
+        self.reset_after = reset_after
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._consecutive = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        return self._state
+
+    def allow(self):
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_after:
+                self._state = "half_open"
+                self._probing = False
+            if self._state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, ok, elapsed=0.0):
+        # A call that succeeded but blew the latency budget counts as a failure.
+        slow = self.latency_budget is not None and elapsed > self.latency_budget
+        with self._lock:
+            if ok and not slow:
+                self._state = "closed"
+                self._consecutive = 0
+                self._probing = False
+                return
+            self._consecutive += 1
+            if self._state == "half_open" or self._consecutive >= self.failures:
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self._probing = False
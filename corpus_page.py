@@ -0,0 +1,440 @@
+# corpus_page.py
+# One page engine for every corpus in the corpus_data registry.
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+import corpus_store
+import perf
+import thumbnails
+from corpus_data import corpus_data, image_urls
+
+PAGE_CSS = """
+<style>
+.litarc-title {
+    font-family: Georgia, serif;
+    font-size: 4em;
+    font-weight: bold;
+    text-align: center;
+    margin-top: 20px;
+    margin-bottom: 30px;
+    background: linear-gradient(90deg, #8B0000, #111);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    color: transparent;
+}
+h1 {
+    font-family: Georgia, serif;
+    font-weight: 700;
+    font-size: 3.5em;
+    text-align: center;
+    background: linear-gradient(90deg, #8B0000 50%, #111 50%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+    color: transparent;
+    margin-bottom: 30px;
+}
+.corpus-table {
+    font-family: Georgia, serif;
+    border-collapse: collapse;
+    width: 80%;
+    margin-left: auto;
+    margin-right: auto;
+    margin-top: 30px;
+    box-shadow: 0 0 12px rgba(0,0,0,0.15);
+    border-radius: 12px;
+    overflow: hidden;
+}
+.corpus-table th, .corpus-table td {
+    border: 1px solid #ddd;
+    padding: 12px 18px;
+    text-align: center;
+    font-size: 1.1em;
+}
+.corpus-table th {
+    background-color: #8B0000;
+    color: white;
+    font-weight: 700;
+}
+.corpus-table tr:nth-child(even) {
+    background-color: #f9f9f9;
+}
+</style>
+<div class="litarc-title">LitArc</div>
+"""
+
+CATALOGUE_CSS = """
+<style>
+.center-table-container {
+    display: flex;
+    justify-content: center;
+    margin-top: 20px;
+    margin-bottom: 40px;
+}
+
+.scroll-table-wrapper {
+    max-height: 400px;
+    overflow-y: auto;
+    border-radius: 12px;
+    box-shadow: 0 0 12px rgba(0,0,0,0.1);
+    width: 90%;
+}
+
+/* Style the actual table */
+.scroll-table-wrapper table {
+    border-collapse: collapse;
+    width: 100%;
+    font-family: Georgia, serif;
+    font-size: 1.05em;
+}
+
+.scroll-table-wrapper th {
+    background-color: #8B0000;
+    color: white;
+    font-weight: bold;
+    position: sticky;
+    top: 0;
+    z-index: 1;
+    padding: 12px 18px;
+    border-bottom: 2px solid #ddd;
+    text-align: center;
+}
+
+.scroll-table-wrapper td {
+    padding: 12px 18px;
+    border-bottom: 1px solid #eee;
+    text-align: center;
+}
+
+.scroll-table-wrapper tr:nth-child(even) {
+    background-color: #f9f9f9;
+}
+</style>
+"""
+
+# Metadata columns shown in the catalogue, with their display names
+CATALOGUE_COLUMNS = {
+    "firstAuthor": "Author",
+    "title": "Title",
+    "subtitle": "Subtitle",
+    "yearPrinted": "Year Printed",
+}
+
+# Columns the catalogue filter searches
+SEARCH_COLUMNS = ["Author", "Title", "Subtitle"]
+PAGE_SIZES = [25, 50, 100]
+# Author chart: bars for the most prolific authors, the rest folded into one
+# "Others" bar; past WEBGL_THRESHOLD authors it is drawn with WebGL markers.
+TOP_AUTHORS = [30, 10, 100, None]
+WEBGL_THRESHOLD = 200
+
+corpora = {short: (name, desc) for name, short, desc in corpus_data}
+
+
+def stats_from_metrics(m):
+    wordcount = m.get('wordcount', {})
+    return {
+        'Plays': m.get('plays'),
+        'Characters': m.get('characters'),
+        'Male Characters': m.get('male'),
+        'Female Characters': m.get('female'),
+        'Spoken Segments': m.get('sp'),
+        'Stage Directions': m.get('stage'),
+        'Total Word Count': sum([
+            wordcount.get('text', 0),
+            wordcount.get('sp', 0),
+            wordcount.get('stage', 0)
+        ]),
+        'Word Count (Spoken Segments)': wordcount.get('sp'),
+        'Word Count (Stage Directions)': wordcount.get('stage')
+    }
+
+
+# Per-play metadata columns summed into the statistics table
+STATS_COLUMNS = [
+    "numOfSpeakers", "numOfSpeakersMale", "numOfSpeakersFemale",
+    "wordCountText", "wordCountSp", "wordCountStage",
+]
+
+
+def stats_from_metadata(df_meta, metrics=None):
+    # The statistics table from the metadata frame in one vectorized pass.
+    # Segment counts are not in the CSV; they come from the API metrics when
+    # those happen to be cached, and stay empty otherwise.
+    sums = df_meta[[col for col in STATS_COLUMNS if col in df_meta.columns]].sum()
+    total = {col: int(sums[col]) for col in sums.index}
+    metrics = metrics or {}
+    return {
+        'Plays': len(df_meta),
+        'Characters': total.get('numOfSpeakers'),
+        'Male Characters': total.get('numOfSpeakersMale'),
+        'Female Characters': total.get('numOfSpeakersFemale'),
+        'Spoken Segments': metrics.get('sp'),
+        'Stage Directions': metrics.get('stage'),
+        'Total Word Count': sum([
+            total.get('wordCountText', 0),
+            total.get('wordCountSp', 0),
+            total.get('wordCountStage', 0)
+        ]),
+        'Word Count (Spoken Segments)': total.get('wordCountSp'),
+        'Word Count (Stage Directions)': total.get('wordCountStage')
+    }
+
+
+def stats_html(corpus_stats):
+    table_html = "<table class='corpus-table'>"
+    table_html += "<tr><th>Metric</th><th>Value</th></tr>"
+    for key, val in corpus_stats.items():
+        table_html += f"<tr><td>{key}</td><td>{'–' if val is None else val}</td></tr>"
+    table_html += "</table>"
+    return table_html
+
+
+def fetch_metadata(corpus_name):
+    return corpus_store.metadata(corpus_name)
+
+
+def prepare_catalogue(df_meta):
+    return df_meta[list(CATALOGUE_COLUMNS)].rename(columns=CATALOGUE_COLUMNS)
+
+
+def filter_catalogue(df_show, query):
+    query = query.strip().lower()
+    if not query:
+        return df_show
+    mask = pd.Series(False, index=df_show.index)
+    for col in SEARCH_COLUMNS:
+        values = df_show[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Match against the (few) distinct authors, not every row
+            cats = values.cat.categories
+            hits = cats[cats.str.lower().str.contains(query, regex=False)]
+            mask |= values.isin(hits)
+        else:
+            mask |= values.str.lower().str.contains(query, regex=False, na=False)
+    return df_show[mask]
+
+
+def catalogue_page(df_show, query="", sort_by="Author", ascending=True, page=1, page_size=PAGE_SIZES[0]):
+    # Filter and sort on the server and hand back only the requested page of rows
+    rows = filter_catalogue(df_show, query)
+    total = len(rows)
+    n_pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+    if sort_by:
+        rows = rows.sort_values(sort_by, ascending=ascending, na_position="last", kind="stable")
+    return rows.iloc[start:start + page_size], total, page, n_pages
+
+
+def catalogue_html(rows):
+    return rows.astype(object).fillna("").to_html(index=False, escape=False)
+
+
+def author_counts(df_show, top=None):
+    # Plays per author, most prolific first (ties alphabetical); with top,
+    # everyone past the first top authors is summed into an "Others" bar.
+    counts = df_show.groupby("Author", observed=True).size().sort_values(ascending=False, kind="stable")
+    counts.index = counts.index.astype(str)
+    if top and len(counts) > top:
+        rest = counts.iloc[top:]
+        counts = pd.concat([counts.iloc[:top], pd.Series({f"Others ({len(rest):,} authors)": rest.sum()})])
+    return counts.rename_axis("Author").reset_index(name="Number of Plays")
+
+
+def nice_dtick(max_value, target_ticks=10):
+    # Smallest 1/2/5 x 10^k step that keeps the axis to about target_ticks ticks
+    if not max_value or max_value <= target_ticks:
+        return 1
+    raw = max_value / target_ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for step in (1, 2, 5, 10):
+        if step * magnitude >= raw:
+            return step * magnitude
+    return 10 * magnitude
+
+
+def author_figure(counts, height=600):
+    if len(counts) > WEBGL_THRESHOLD:
+        # Too many bars for SVG: one WebGL marker per author, no tick labels
+        fig = go.Figure(go.Scattergl(
+            x=counts["Author"],
+            y=counts["Number of Plays"],
+            mode="markers",
+            hovertemplate="Author=%{x}<br>Count of Plays=%{y}<extra></extra>",
+        ))
+        fig.update_layout(height=height, xaxis_title="Author", yaxis_title="Count of Plays")
+        fig.update_xaxes(showticklabels=False)
+    else:
+        fig = px.bar(
+            counts,
+            x="Author",
+            y="Number of Plays",
+            labels={"Author": "Author", "Number of Plays": "Count of Plays"},
+            height=height,
+        )
+    fig.update_xaxes(categoryorder="trace")
+    fig.update_yaxes(dtick=nice_dtick(counts["Number of Plays"].max()))
+    return fig
+
+
+# Built author charts by (corpus, hash of the author column, chart options).
+# px.bar is the slowest step of a rerun and its input only changes when the
+# metadata does; figures are shared read-only between sessions.
+FIGURE_CACHE_SIZE = 64
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+def authors_version(df_show):
+    return int(pd.util.hash_pandas_object(df_show["Author"], index=False).sum())
+
+
+def cached_author_figure(short, df_show, top=TOP_AUTHORS[0], height=600):
+    key = (short, authors_version(df_show), top, height)
+    with _figures_lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+    perf.increment("cache_lookups", {"cache": "figure", "corpus": short, "result": "miss" if fig is None else "hit"})
+    if fig is None:
+        fig = author_figure(author_counts(df_show, top), height)
+        with _figures_lock:
+            _figures[key] = fig
+            while len(_figures) > FIGURE_CACHE_SIZE:
+                _figures.popitem(last=False)
+    return fig
+
+
+def render(short):
+    with perf.span(short, "rerun_total"):
+        _render(short)
+
+
+def _render(short):
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+    if short not in corpora:
+        st.error("Corpus not found.")
+        st.stop()
+    name, desc = corpora[short]
+
+    # The statistics table and the catalogue both come from the metadata
+    try:
+        with perf.span(short, "metadata_lookup"):
+            df_meta = fetch_metadata(short)
+    except Exception:
+        df_meta = None
+    with perf.span(short, "stats"):
+        corpus_stats = None if df_meta is None else stats_from_metadata(df_meta, corpus_store.cached_metrics(short))
+
+    # Title
+    st.markdown(f"<h1>{name}</h1>", unsafe_allow_html=True)
+
+    since = corpus_store.stale_since(short)
+    if since is not None:
+        when = f" from {time.strftime('%d %b %Y, %H:%M', time.localtime(since))}" if since else ""
+        st.warning(f"DraCor is not responding right now. Showing the last data received{when}.")
+
+    image_url = image_urls.get(short)
+    if image_url:
+        banner = thumbnails.picture(short, "banner", image_url, style="max-width: 100%; height: auto; border-radius: 10px;")
+        st.markdown(f"""
+            <div style="display: flex; justify-content: center; margin: 20px 0;">
+                {banner}
+            </div>
+        """, unsafe_allow_html=True)
+
+    # Description
+    st.markdown(f"""
+    <div style="font-family: Georgia, serif; font-size: 1.2em; text-align: justify; margin-top: 20px;">
+        {desc}
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Key insights table
+    st.markdown("""
+    <h2 style='text-align: center; font-family: Georgia, serif;'>🎭 Corpus Statistics</h2>
+    """, unsafe_allow_html=True)
+
+    if corpus_stats is None:
+        st.error("Failed to fetch corpus statistics.")
+    else:
+        st.markdown(stats_html(corpus_stats), unsafe_allow_html=True)
+
+    # Author-Play Catalogue
+    st.markdown("""
+    <h2 style='text-align: center; font-family: Georgia, serif;'>🎭 Author-Play Catalogue</h2>
+    """, unsafe_allow_html=True)
+
+    if df_meta is None:
+        st.error("Failed to fetch the play catalogue.")
+        st.stop()
+
+    # Validate required columns
+    missing = [col for col in CATALOGUE_COLUMNS if col not in df_meta.columns]
+    if missing:
+        st.error(f"Required columns not found in metadata: {missing}")
+        st.stop()
+
+    with perf.span(short, "transform"):
+        df_show = prepare_catalogue(df_meta)
+
+    # Display the table, one page of rows at a time
+    st.markdown(CATALOGUE_CSS, unsafe_allow_html=True)
+
+    filter_col, sort_col, order_col, size_col = st.columns([3, 2, 2, 1])
+    query = filter_col.text_input("Filter", key=f"{short}-catalogue-filter", placeholder="Author, title or subtitle")
+    sort_by = sort_col.selectbox("Sort by", list(df_show.columns), key=f"{short}-catalogue-sort")
+    order = order_col.selectbox("Order", ["Ascending", "Descending"], key=f"{short}-catalogue-order")
+    page_size = size_col.selectbox("Rows", PAGE_SIZES, key=f"{short}-catalogue-size")
+
+    page_key = f"{short}-catalogue-page"
+    with perf.span(short, "paginate"):
+        rows, total, page, n_pages = catalogue_page(
+            df_show, query, sort_by, order == "Ascending", st.session_state.get(page_key, 1), page_size
+        )
+    # A narrower filter can leave the stored page number past the end
+    if st.session_state.get(page_key, 1) != page:
+        st.session_state[page_key] = page
+
+    with perf.span(short, "html"):
+        rows_html = catalogue_html(rows)
+
+    st.markdown(f"""
+<div class="center-table-container">
+    <div class="scroll-table-wrapper">
+        {rows_html}
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+    info_col, page_col = st.columns([3, 1])
+    first = (page - 1) * page_size + 1 if total else 0
+    info_col.caption(f"Showing {first}–{min(page * page_size, total)} of {total:,} plays")
+    page_col.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    st.markdown("<div style='height: 50px;'></div>", unsafe_allow_html=True)
+
+    st.markdown("""
+    <h2 style='text-align: center; font-family: Georgia, serif;'>🎭 No of Authors per Play</h2>
+    """, unsafe_allow_html=True)
+
+    # 📊 Bar chart: Number of Plays per Author
+    top = st.selectbox(
+        "Authors", TOP_AUTHORS, key=f"{short}-chart-top",
+        format_func=lambda n: "All" if n is None else f"Top {n}",
+    )
+    with perf.span(short, "figure"):
+        fig = cached_author_figure(short, df_show, top)
+
+    # Display the chart (serialized to JSON here)
+    with perf.span(short, "chart_send"):
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,550 @@
+# corpus_store.py
+# Process-wide caches of parsed DraCor data, shared by every page and session.
+import csv
+import heapq
+import io
+import itertools
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+import dracor_client
+import perf
+import shared_cache
+import snapshot
+
+# "live" fetches from DraCor (serving the snapshot, if one was built, until the
+# first refresh lands); "snapshot" reads only the bundled snapshot, no network.
+DATA_MODE = os.environ.get("LITARC_DATA_MODE", "live")
+
+METRICS_TTL = 600
+METADATA_TTL = 3600
+RETRY_AFTER = 60
+WARMUP_WORKERS = 8
+# Background reloads: at most this many at once, each corpus reloaded after
+# a random 80-100% of its TTL so that entries loaded together drift apart
+REFRESH_WORKERS = 4
+REFRESH_JITTER = 0.2
+# Data another process published is reused only while it is younger than
+# this share of the TTL; a scheduled reload (at 80-100% of the TTL) always
+# finds our own last load too old and downloads again.
+SHARED_FRESH = REFRESH_JITTER
+# Memory budget for parsed metadata across all corpora, and how long an
+# unused corpus may stay in memory
+CACHE_BUDGET = int(float(os.environ.get("LITARC_CACHE_BUDGET_MB", "512")) * 2**20)
+METADATA_MAX_IDLE = 6 * 3600
+
+
+class RefreshScheduler:
+    # Reloads registered entries ahead of their TTL, each on its own jittered
+    # period, so user reruns find fresh data instead of triggering a reload.
+    # Every background reload runs on one small pool, which caps how many
+    # requests go out at once.
+
+    def __init__(self, workers, jitter):
+        self.jitter = jitter
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="litarc-refresh")
+        self._queue = []  # (due, seq, entry)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def period(self, ttl):
+        return ttl * random.uniform(1 - self.jitter, 1)
+
+    def schedule(self, entry, delay):
+        with self._cond:
+            seq = next(self._seq)
+            entry._scheduled = seq
+            heapq.heappush(self._queue, (time.monotonic() + delay, seq, entry))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="litarc-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def submit(self, fn):
+        self._pool.submit(fn)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue or self._queue[0][0] > time.monotonic():
+                    self._cond.wait(self._queue[0][0] - time.monotonic() if self._queue else None)
+                _, seq, entry = heapq.heappop(self._queue)
+            # Skip entries rescheduled or closed since this slot was queued
+            if entry._scheduled == seq and not entry.closed:
+                entry._revalidate()
+
+    def pending(self):
+        now = time.monotonic()
+        with self._cond:
+            return [
+                (entry.name, due - now) for due, seq, entry in sorted(self._queue)
+                if entry._scheduled == seq and not entry.closed
+            ]
+
+
+class StaleWhileRevalidate:
+    # Holds one loaded value. Once the TTL has passed the old value keeps
+    # being served while a single background thread reloads it; only the
+    # very first load blocks the caller. An optional seed provides a
+    # starting value that is served at once and revalidated right away.
+    # on_load, if set, is called with every newly loaded value. With a
+    # scheduler, reloads happen ahead of the TTL on the scheduler's pool.
+    # age, if set, says how old a value the loader just returned already is
+    # (e.g. read from another process's file); that counts against the TTL.
+
+    def __init__(self, loader, ttl, seed=None, on_load=None, scheduler=None, name=None, age=None):
+        self.loader = loader
+        self.ttl = ttl
+        self.seed = seed
+        self.on_load = on_load
+        self.scheduler = scheduler
+        self.name = name
+        self.age = age
+        self.closed = False
+        self._value = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._scheduled = None
+
+    def get(self):
+        if self._loaded_at is None:
+            with self._lock:
+                if self._loaded_at is None:
+                    seeded = self.seed() if self.seed else None
+                    if seeded is None:
+                        try:
+                            self._value = self.loader()
+                        except Exception:
+                            # Nothing to serve yet; keep trying in the background
+                            # too, in case no caller asks again
+                            self._schedule(RETRY_AFTER)
+                            raise
+                        self._loaded_at = time.monotonic() - self._age()
+                    else:
+                        self._value = seeded
+                        self._loaded_at = time.monotonic() - self.ttl - 1
+                    if self.on_load:
+                        self.on_load(self._value)
+                    if seeded is None:
+                        self._schedule(self._next_delay())
+        if time.monotonic() - self._loaded_at > self.ttl:
+            self._revalidate()
+        return self._value
+
+    def peek(self):
+        return self._value
+
+    def state(self):
+        # What get() would do right now: "miss", "stale" or "hit"
+        if self._loaded_at is None:
+            return "miss"
+        return "stale" if time.monotonic() - self._loaded_at > self.ttl else "hit"
+
+    def close(self):
+        # Stop scheduled reloads (the entry was evicted)
+        self.closed = True
+
+    def _age(self):
+        return max(0, self.age() or 0) if self.age else 0
+
+    def _next_delay(self):
+        # A full jittered period after the data was current, not after we got it
+        if self.scheduler:
+            return max(0, self.scheduler.period(self.ttl) - (time.monotonic() - self._loaded_at))
+        return None
+
+    def _schedule(self, delay=None):
+        if self.scheduler and not self.closed:
+            self.scheduler.schedule(self, self.scheduler.period(self.ttl) if delay is None else delay)
+
+    def _revalidate(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        if self.scheduler:
+            self.scheduler.submit(self._refresh)
+        else:
+            threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        try:
+            value = self.loader()
+        except Exception:
+            # Keep serving the old value (if any); try again a little later.
+            if self._loaded_at is not None:
+                self._loaded_at = time.monotonic() - self.ttl + RETRY_AFTER
+            self._schedule(RETRY_AFTER)
+        else:
+            # One assignment publishes the new value to every reader
+            self._value, self._loaded_at = value, time.monotonic() - self._age()
+            if self.on_load:
+                self.on_load(value)
+            self._schedule(self._next_delay())
+        finally:
+            self._refreshing = False
+
+
+_scheduler = RefreshScheduler(REFRESH_WORKERS, REFRESH_JITTER)
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+class BoundedCache:
+    # Keyed StaleWhileRevalidate entries under one byte budget: the least
+    # recently used entries are evicted once the budget is exceeded, and
+    # entries idle for longer than max_idle are dropped. Values are handed
+    # to every caller as the same object, never copied: callers must not
+    # modify a frame in place (no column assignment, no inplace=True) and
+    # should .copy() one they need to change. Only pandas 3, or 2.x with
+    # copy-on-write switched on, would protect the cached frame by itself.
+
+    def __init__(self, name, budget, max_idle, sizeof, scheduler=None):
+        self.name = name
+        self.budget = budget
+        self.max_idle = max_idle
+        self.sizeof = sizeof
+        self.scheduler = scheduler
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._used = {}
+        self._lock = threading.RLock()
+        self.bytes = 0
+        self.evictions = 0
+
+    def entry(self, key, loader, ttl, seed=None, age=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = StaleWhileRevalidate(
+                    loader, ttl, seed, scheduler=self.scheduler, name=f"{self.name}:{key}", age=age
+                )
+                entry.on_load = lambda value, entry=entry: self._account(key, entry, value)
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._used[key] = now
+            self._expire(now)
+        return entry
+
+    def peek(self, key):
+        entry = self._entries.get(key)
+        return None if entry is None else entry.peek()
+
+    def state(self, key):
+        entry = self._entries.get(key)
+        return "miss" if entry is None else entry.state()
+
+    def _account(self, key, entry, value):
+        with self._lock:
+            if self._entries.get(key) is not entry:
+                return  # evicted while it was loading
+            size = self.sizeof(value)
+            self.bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            for old in list(self._entries):
+                if self.bytes <= self.budget:
+                    break
+                if old != key:
+                    self._drop(old)
+            self._publish()
+
+    def _expire(self, now):
+        while self._entries:
+            oldest = next(iter(self._entries))
+            if now - self._used[oldest] <= self.max_idle:
+                break
+            self._drop(oldest)
+            self._publish()
+
+    def _drop(self, key):
+        self._entries.pop(key).close()
+        del self._used[key]
+        self.bytes -= self._sizes.pop(key, 0)
+        self.evictions += 1
+        perf.increment("cache_evictions", {"cache": self.name})
+
+    def _publish(self):
+        perf.set_gauge("cache_bytes", {"cache": self.name}, self.bytes)
+        perf.set_gauge("cache_entries", {"cache": self.name}, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries.values():
+                entry.close()
+            self._entries.clear()
+            self._sizes.clear()
+            self._used.clear()
+            self.bytes = 0
+            self._publish()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "budget": self.budget,
+                "evictions": self.evictions,
+                "sizes": dict(self._sizes),
+            }
+
+
+def _from_snapshot(reader, *args):
+    if DATA_MODE != "live" or not snapshot.exists():
+        return None
+    try:
+        return reader(*args)
+    except (OSError, ValueError):
+        return None
+
+
+METRICS_PATH = "corpora?include=metrics"
+
+
+def metadata_path(corpus_code):
+    return f"corpora/{corpus_code}/metadata/csv"
+
+
+def fetch_metrics_index():
+    corpora = dracor_client.get_json(METRICS_PATH)
+    return {c["name"]: c for c in corpora}
+
+
+def _publish_metrics_index():
+    index = fetch_metrics_index()
+    if snapshot.exists():
+        snapshot.write_metrics(index)
+    return snapshot.metrics_table(index)
+
+
+def _shared_age(key, ttl):
+    # How old the shared data just loaded is. Anything older than
+    # SHARED_FRESH was read because downloading failed; it is counted as
+    # that old so the retry comes after a normal (shorter) period rather
+    # than at once.
+    if DATA_MODE == "snapshot":
+        return 0
+    return min(shared_cache.age(key) or 0, ttl * SHARED_FRESH)
+
+
+def _load_metrics_index():
+    if DATA_MODE == "snapshot":
+        return snapshot.read_metrics()
+    # One process per host fetches; the others read what it published.
+    table = shared_cache.get_or_load("metrics", _publish_metrics_index, METRICS_TTL * SHARED_FRESH)
+    return snapshot.metrics_from_table(table)
+
+
+def _metrics_cache():
+    return StaleWhileRevalidate(
+        _load_metrics_index,
+        METRICS_TTL,
+        seed=lambda: _from_snapshot(snapshot.read_metrics),
+        scheduler=_scheduler,
+        name="metrics",
+        age=lambda: _shared_age("metrics", METRICS_TTL),
+    )
+
+
+_metrics = _metrics_cache()
+
+
+def metrics_index():
+    return _metrics.get()
+
+
+def cached_metrics(corpus_code):
+    # Metrics already in memory, or None; never fetches.
+    index = _metrics.peek()
+    corpus = index.get(corpus_code) if index else None
+    return None if corpus is None else corpus.get("metrics", {})
+
+
+# Metadata columns the pages use, with the compact dtype each is parsed to.
+# Everything else in the CSV is skipped at parse time.
+METADATA_COLUMNS = {
+    "firstAuthor": "category",
+    "title": "string",
+    "subtitle": "string",
+    "yearPrinted": "Int16",
+    "numOfSpeakers": "Int32",
+    "numOfSpeakersMale": "Int32",
+    "numOfSpeakersFemale": "Int32",
+    "wordCountText": "Int32",
+    "wordCountSp": "Int32",
+    "wordCountStage": "Int32",
+}
+
+_ARROW_TYPES = {
+    "category": pa.dictionary(pa.int32(), pa.string()),
+    "string": pa.string(),
+    "Int16": pa.int16(),
+    "Int32": pa.int32(),
+}
+_PANDAS_TYPES = {pa.string(): pd.StringDtype(), pa.int16(): pd.Int16Dtype(), pa.int32(): pd.Int32Dtype()}
+
+
+def _csv_header(body):
+    # The first line; a body without a newline is all header
+    end = body.find(b"\n")
+    line = body if end < 0 else body[:end]
+    return next(csv.reader([line.decode("utf-8-sig").rstrip("\r")]), [])
+
+
+def _parse_with_arrow(body, columns):
+    types = {col: _ARROW_TYPES[dtype] for col, dtype in columns.items()}
+    table = pa_csv.read_csv(
+        pa.py_buffer(body),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(columns), column_types=types, strings_can_be_null=True
+        ),
+    )
+    return table.to_pandas(types_mapper=_PANDAS_TYPES.get)
+
+
+def _parse_with_pandas(body, columns):
+    numeric = [col for col, dtype in columns.items() if dtype.startswith("Int")]
+    df = pd.read_csv(
+        io.BytesIO(body),
+        usecols=list(columns),
+        dtype={col: dtype for col, dtype in columns.items() if col not in numeric},
+    )
+    for col in numeric:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype(columns[col])
+    return df
+
+
+def parse_metadata(body, columns=None):
+    # Parse only the wanted columns straight from the response bytes.
+    columns = columns or METADATA_COLUMNS
+    present = set(_csv_header(body))
+    columns = {col: dtype for col, dtype in columns.items() if col in present}
+    try:
+        df = _parse_with_arrow(body, columns)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # e.g. a year that is not an integer; pandas coerces it to NA
+        df = _parse_with_pandas(body, columns)
+    # Alphabetical categories, so sorting a categorical column sorts by name
+    for col, dtype in columns.items():
+        if dtype == "category":
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    return df
+
+
+def fetch_metadata(corpus_code):
+    body = dracor_client.fetch(metadata_path(corpus_code)).body
+    with perf.span(corpus_code, "csv_parse"):
+        return parse_metadata(body)
+
+
+def _publish_metadata(corpus_code):
+    df = fetch_metadata(corpus_code)
+    if snapshot.exists():
+        snapshot.write_metadata(corpus_code, df)
+    return snapshot.metadata_table(df)
+
+
+def _load_metadata(corpus_code):
+    if DATA_MODE == "snapshot":
+        return snapshot.read_metadata(corpus_code)
+    table = shared_cache.get_or_load(
+        f"metadata-{corpus_code}", lambda: _publish_metadata(corpus_code), METADATA_TTL * SHARED_FRESH
+    )
+    return shared_cache.to_pandas(table)
+
+
+_metadata = BoundedCache("metadata", CACHE_BUDGET, METADATA_MAX_IDLE, frame_bytes, scheduler=_scheduler)
+
+
+def metadata(corpus_code):
+    entry = _metadata.entry(
+        corpus_code,
+        lambda: _load_metadata(corpus_code),
+        METADATA_TTL,
+        seed=lambda: _from_snapshot(snapshot.read_metadata, corpus_code),
+        age=lambda: _shared_age(f"metadata-{corpus_code}", METADATA_TTL),
+    )
+    perf.increment("cache_lookups", {"cache": "metadata", "corpus": corpus_code, "result": entry.state()})
+    return entry.get()
+
+
+def cached_metadata(corpus_code):
+    # Metadata already in memory, or None; never fetches.
+    return _metadata.peek(corpus_code)
+
+
+def stale_since(corpus_code):
+    # When the metadata shown for a corpus was last confirmed by DraCor, if
+    # the latest attempt to refresh it failed (0 if unknown); None while
+    # healthy. The metrics index only adds the optional segment counts, so a
+    # failure there does not count as the page being stale.
+    return dracor_client.stale_since(metadata_path(corpus_code))
+
+
+def cache_stats():
+    return _metadata.stats()
+
+
+def refresh_schedule():
+    # (entry name, seconds until its next background reload)
+    return _scheduler.pending()
+
+
+def clear():
+    # Drop every in-memory entry (benchmarks use this for cold runs).
+    global _metrics
+    _metrics.close()
+    _metrics = _metrics_cache()
+    _metadata.clear()
+
+
+_warmup = {"started": None, "finished": None, "corpora": {}}
+_warmup_lock = threading.Lock()
+
+
+def _warm(corpus_code):
+    start = time.perf_counter()
+    try:
+        metadata(corpus_code)
+    except Exception as exc:
+        _warmup["corpora"][corpus_code] = {"seconds": time.perf_counter() - start, "error": repr(exc)}
+    else:
+        _warmup["corpora"][corpus_code] = {"seconds": time.perf_counter() - start, "error": None}
+
+
+def _run_warmup(corpus_codes, max_workers):
+    try:
+        metrics_index()
+    except Exception:
+        pass
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="litarc-warmup") as pool:
+        list(pool.map(_warm, corpus_codes))
+    _warmup["finished"] = time.time()
+
+
+def start_warmup(corpus_codes, max_workers=WARMUP_WORKERS):
+    # Prefetch metrics and metadata for every corpus in the background, once
+    # per process. Safe to call on every rerun of app.py.
+    with _warmup_lock:
+        if _warmup["started"] is not None:
+            return
+        _warmup["started"] = time.time()
+    threading.Thread(
+        target=_run_warmup, args=(list(corpus_codes), max_workers), name="litarc-warmup", daemon=True
+    ).start()
+
+
+def warmup_status():
+    return dict(_warmup, corpora=dict(_warmup["corpora"]))
@@ -0,0 +1,260 @@
+# dracor_client.py
+# Shared HTTP client for the DraCor API. One pooled session per process,
+# so every page and every rerun reuses the same keep-alive connections.
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_cache
+import perf
+from breaker import CircuitBreaker
+from singleflight import SingleFlight
+
+# Point at a local stand-in (benchmarks/standin.py) with DRACOR_API_BASE.
+API_BASE = os.environ.get("DRACOR_API_BASE", "https://dracor.org/api/v1/").rstrip("/") + "/"
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 8
+POOL_SIZE = 32
+CHUNK_SIZE = 64 * 1024
+# Disk-cached responses younger than this are served without revalidating.
+FRESH_FOR = 300
+# Connection errors, 5xx and 429 are retried up to RETRIES times with
+# exponential backoff (or the server's Retry-After), while there is budget
+# left. A read timeout is not retried: the upstream is hanging.
+RETRIES = 2
+BACKOFF = 0.5
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+# Per endpoint: open after this many consecutive errors or calls slower than
+# the budget, and let one probe through after RESET seconds. The budget is
+# also a hard wall-clock deadline for a call, retries and body included.
+BREAKER_FAILURES = 5
+LATENCY_BUDGET = 15
+BREAKER_RESET = 30
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+_flights = SingleFlight()
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+# path -> time its most recent upstream attempt failed; cleared on success
+_failed = {}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+
+class DeadlineExceeded(requests.Timeout):
+    pass
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # Retries are done by _download(), within the deadline
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = "LitArc"
+                _session = session
+    return _session
+
+
+def endpoint_of(path):
+    # Collapse corpus and play names so latency is accounted per endpoint,
+    # e.g. "corpora/fre/metadata/csv" -> "corpora/{corpus}/metadata/csv"
+    route, _, query = path.partition("?")
+    parts = route.strip("/").split("/")
+    if len(parts) > 1 and parts[0] == "corpora":
+        parts[1] = "{corpus}"
+        if len(parts) > 3 and parts[2] == "plays":
+            parts[3] = "{play}"
+    endpoint = "/".join(parts)
+    return f"{endpoint}?{query}" if query else endpoint
+
+
+def corpus_of(path):
+    parts = path.partition("?")[0].strip("/").split("/")
+    return parts[1] if len(parts) > 1 and parts[0] == "corpora" else None
+
+
+def _record(path, elapsed, nbytes, ok):
+    corpus = corpus_of(path)
+    perf.observe(corpus, "dracor_request", elapsed)
+    perf.increment("dracor_corpus_bytes", {"corpus": corpus or "-"}, nbytes)
+    key = endpoint_of(path)
+    with _stats_lock:
+        s = _stats.setdefault(key, {"requests": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0})
+        s["requests"] += 1
+        s["seconds"] += elapsed
+        s["max_seconds"] = max(s["max_seconds"], elapsed)
+        s["bytes"] += nbytes
+        if not ok:
+            s["errors"] += 1
+
+
+def latency_stats():
+    with _stats_lock:
+        out = {}
+        for key, s in _stats.items():
+            breaker = _breakers.get(key)
+            out[key] = dict(
+                s,
+                mean_seconds=s["seconds"] / s["requests"] if s["requests"] else 0.0,
+                circuit=breaker.state if breaker else "closed",
+            )
+        return out
+
+
+def breaker_for(path):
+    key = endpoint_of(path)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(key, CircuitBreaker(BREAKER_FAILURES, LATENCY_BUDGET, BREAKER_RESET))
+    return breaker
+
+
+def _upstream_fault(exc):
+    # Client errors such as a 404 say nothing about the health of DraCor.
+    response = getattr(exc, "response", None)
+    return response is None or response.status_code == 429 or response.status_code >= 500
+
+
+def stale_since(path):
+    # None while path is healthy. After its last upstream attempt failed, the
+    # time the data being served for it was last confirmed (0 if unknown).
+    if path not in _failed:
+        return None
+    cached = http_cache.lookup(f"{API_BASE}{path}")
+    return cached.stored_at if cached is not None else 0
+
+
+def _attempt(url, deadline, **kwargs):
+    # One GET, body included, cut off at the deadline. The read timeout only
+    # bounds each socket read, so a trickling upstream is stopped by a timer
+    # that shuts the socket down under a blocked read.
+    remaining = deadline - time.monotonic()
+    resp = get_session().get(
+        url, stream=True, timeout=(min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining)), **kwargs
+    )
+    guard = threading.Timer(max(0.0, deadline - time.monotonic()), resp.raw.shutdown)
+    guard.daemon = True
+    guard.start()
+    chunks = []
+    try:
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            if time.monotonic() >= deadline:
+                break
+    except requests.RequestException:
+        if time.monotonic() < deadline:
+            raise
+    finally:
+        guard.cancel()
+        resp.close()
+    if time.monotonic() >= deadline:
+        raise DeadlineExceeded(f"no complete response from {url} within {LATENCY_BUDGET}s")
+    resp._content = b"".join(chunks)
+    return resp
+
+
+def _retry_after(resp):
+    value = resp.headers.get("Retry-After", "")
+    return float(value) if value.isdigit() else None
+
+
+def _download(url, **kwargs):
+    deadline = time.monotonic() + LATENCY_BUDGET
+    for attempt in range(RETRIES + 1):
+        error = resp = None
+        try:
+            resp = _attempt(url, deadline, **kwargs)
+        except requests.ConnectionError as exc:
+            error = exc
+        else:
+            if resp.status_code not in RETRY_STATUSES:
+                return resp
+        delay = (resp is not None and _retry_after(resp)) or BACKOFF * 2 ** attempt
+        if attempt == RETRIES or time.monotonic() + delay >= deadline:
+            break
+        time.sleep(delay)
+    if error is not None:
+        raise error
+    return resp
+
+
+def get(path, **kwargs):
+    breaker = breaker_for(path)
+    if not breaker.allow():
+        _failed[path] = time.time()
+        raise CircuitOpenError(f"DraCor circuit open for {endpoint_of(path)}")
+    start = time.perf_counter()
+    try:
+        resp = _download(f"{API_BASE}{path}", **kwargs)
+        resp.raise_for_status()
+    except requests.RequestException as exc:
+        elapsed = time.perf_counter() - start
+        _record(path, elapsed, 0, ok=False)
+        breaker.record(not _upstream_fault(exc), elapsed)
+        _failed[path] = time.time()
+        raise
+    elapsed = time.perf_counter() - start
+    _record(path, elapsed, len(resp.content), ok=True)
+    breaker.record(True, elapsed)
+    _failed.pop(path, None)
+    return resp
+
+
+def fetch(path):
+    # Identical concurrent requests share one upstream download.
+    return _flights.do(path, lambda: _fetch(path))
+
+
+def _fetch(path):
+    url = f"{API_BASE}{path}"
+    cached = http_cache.lookup(url)
+    if cached is not None and http_cache.age(cached) < FRESH_FOR:
+        # e.g. another process got through to DraCor since our last failure
+        _failed.pop(path, None)
+        return cached
+
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    resp = get(path, headers=headers)
+    if resp.status_code == 304 and cached is not None:
+        http_cache.touch(url)
+        return cached
+    return http_cache.store(
+        url,
+        resp.content,
+        content_type=resp.headers.get("Content-Type"),
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+    )
+
+
+def get_json(path):
+    return json.loads(fetch(path).body)
+
+
+def get_text(path):
+    return fetch(path).body.decode("utf-8")
@@ -0,0 +1,35 @@
+# home_cards.py
+# The home page's corpus cards as one HTML fragment, built once per version
+# of the registry (corpus_data, image_urls and the built thumbnails). It
+# lives here rather than in app.py because Streamlit re-executes app.py as
+# a fresh __main__ on every rerun, which would start the cache empty.
+import hashlib
+import html
+
+import thumbnails
+from corpus_data import corpus_data, image_urls
+
+REGISTRY_VERSION = hashlib.sha1(repr((corpus_data, sorted(image_urls.items()))).encode("utf-8")).hexdigest()
+_grids = {}
+
+
+def build_grid():
+    cards = []
+    for name, short, desc in corpus_data:
+        img_html = thumbnails.picture(short, "card", image_urls.get(short), css_class="link-img", inline=True)
+        cards.append(
+            f'<a href="/{short}" target="_self"><div class="link-card">{img_html}'
+            f'<div class="link-name">{html.escape(name)}</div>'
+            f'<div class="description-text">{html.escape(desc)}</div></div></a>'
+        )
+    return '<div class="card-grid">' + "".join(cards) + "</div>"
+
+
+def grid():
+    version = (REGISTRY_VERSION, thumbnails.version())
+    fragment = _grids.get(version)
+    if fragment is None:
+        fragment = build_grid()
+        _grids.clear()
+        _grids[version] = fragment
+    return fragment
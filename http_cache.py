@@ -0,0 +1,78 @@
+# http_cache.py
+# Persistent on-disk store for DraCor responses. Bodies are kept together
+# with their ETag / Last-Modified validators so that a restart serves warm
+# and revalidating an entry only costs a 304.
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+CACHE_DIR = os.environ.get("LITARC_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+DB_PATH = os.path.join(CACHE_DIR, "http.sqlite")
+
+Entry = namedtuple("Entry", "url body content_type etag last_modified stored_at")
+
+_local = threading.local()
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL
+            )
+        """)
+        _local.conn = conn
+    return conn
+
+
+def lookup(url):
+    try:
+        row = _connect().execute(
+            "SELECT url, body, content_type, etag, last_modified, stored_at FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return Entry(*row) if row else None
+
+
+def store(url, body, content_type=None, etag=None, last_modified=None):
+    entry = Entry(url, body, content_type, etag, last_modified, time.time())
+    try:
+        with _connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)", entry)
+    except sqlite3.Error:
+        pass
+    return entry
+
+
+def touch(url):
+    # A 304 confirms the stored body is still current.
+    try:
+        with _connect() as conn:
+            conn.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), url))
+    except sqlite3.Error:
+        pass
+
+
+def age(entry):
+    return time.time() - entry.stored_at
+
+
+def clear():
+    try:
+        with _connect() as conn:
+            conn.execute("DELETE FROM responses")
+    except sqlite3.Error:
+        pass
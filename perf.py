@@ -0,0 +1,204 @@
+# perf.py
+# Hot-path instrumentation: timing spans per (corpus, stage), labelled
+# counters, percentile summaries and a Prometheus text exposition.
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Recent samples kept per (corpus, stage) for the percentiles
+RESERVOIR = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+
+METRICS_ADDR = os.environ.get("LITARC_METRICS_ADDR", "127.0.0.1")
+METRICS_PORT = os.environ.get("LITARC_METRICS_PORT", "9464")
+# Several workers on one host each take the next free port from METRICS_PORT
+# up, so Prometheus scrapes them as separate targets.
+METRICS_PORTS = int(os.environ.get("LITARC_METRICS_PORTS", "16"))
+
+_log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_samples = {}     # (corpus, stage) -> deque of seconds
+_totals = {}      # (corpus, stage) -> [count, sum]
+_counters = {}    # (name, sorted label items) -> value
+_gauges = {}      # (name, sorted label items) -> value
+
+
+def observe(corpus, stage, seconds):
+    key = (corpus or "-", stage)
+    with _lock:
+        samples = _samples.get(key)
+        if samples is None:
+            samples = _samples[key] = deque(maxlen=RESERVOIR)
+            _totals[key] = [0, 0.0]
+        samples.append(seconds)
+        totals = _totals[key]
+        totals[0] += 1
+        totals[1] += seconds
+
+
+@contextmanager
+def span(corpus, stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(corpus, stage, time.perf_counter() - start)
+
+
+def increment(name, labels, value=1):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name, labels, value):
+    with _lock:
+        _gauges[(name, tuple(sorted(labels.items())))] = value
+
+
+def quantile(sorted_samples, q):
+    if not sorted_samples:
+        return None
+    return sorted_samples[min(len(sorted_samples) - 1, max(0, int(q * len(sorted_samples) + 0.5) - 1))]
+
+
+def summary():
+    # One row per (corpus, stage): count, mean and p50/p95/p99 over recent samples
+    with _lock:
+        snapshot = {key: (sorted(samples), list(_totals[key])) for key, samples in _samples.items()}
+    rows = []
+    for (corpus, stage), (samples, (count, total)) in sorted(snapshot.items()):
+        row = {"corpus": corpus, "stage": stage, "count": count, "mean": total / count if count else None}
+        for q in QUANTILES:
+            row[f"p{int(q * 100)}"] = quantile(samples, q)
+        rows.append(row)
+    return rows
+
+
+def counters(name=None):
+    with _lock:
+        items = sorted(_counters.items())
+    rows = []
+    for (key_name, labels), value in items:
+        if name is None or key_name == name:
+            rows.append(dict(labels, name=key_name, value=value))
+    return rows
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def prometheus_text():
+    import dracor_client
+
+    lines = [
+        "# HELP litarc_stage_seconds Corpus page stage durations.",
+        "# TYPE litarc_stage_seconds summary",
+    ]
+    for row in summary():
+        for q in QUANTILES:
+            value = row[f"p{int(q * 100)}"]
+            lines.append(f"litarc_stage_seconds{{{_labels(corpus=row['corpus'], stage=row['stage'], quantile=q)}}} {value}")
+        lines.append(f"litarc_stage_seconds_count{{{_labels(corpus=row['corpus'], stage=row['stage'])}}} {row['count']}")
+        lines.append(f"litarc_stage_seconds_sum{{{_labels(corpus=row['corpus'], stage=row['stage'])}}} {row['mean'] * row['count']}")
+
+    seen = set()
+    for c in counters():
+        name = f"litarc_{c.pop('name')}_total"
+        value = c.pop("value")
+        if name not in seen:
+            lines.append(f"# TYPE {name} counter")
+            seen.add(name)
+        lines.append(f"{name}{{{_labels(**c)}}} {value}")
+
+    with _lock:
+        gauges = sorted(_gauges.items())
+    seen = set()
+    for (name, labels), value in gauges:
+        name = f"litarc_{name}"
+        if name not in seen:
+            lines.append(f"# TYPE {name} gauge")
+            seen.add(name)
+        lines.append(f"{name}{{{_labels(**dict(labels))}}} {value}")
+
+    stats = dracor_client.latency_stats()
+    for metric, field, kind in (
+        ("litarc_dracor_requests_total", "requests", "counter"),
+        ("litarc_dracor_errors_total", "errors", "counter"),
+        ("litarc_dracor_seconds_total", "seconds", "counter"),
+        ("litarc_dracor_bytes_total", "bytes", "counter"),
+        ("litarc_dracor_max_seconds", "max_seconds", "gauge"),
+    ):
+        lines.append(f"# TYPE {metric} {kind}")
+        for endpoint, s in sorted(stats.items()):
+            lines.append(f"{metric}{{{_labels(endpoint=endpoint)}}} {s[field]}")
+    lines.append("# TYPE litarc_dracor_circuit_open gauge")
+    for endpoint, s in sorted(stats.items()):
+        lines.append(f"litarc_dracor_circuit_open{{{_labels(endpoint=endpoint)}}} {int(s['circuit'] != 'closed')}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def _bind(addr, port, count):
+    # A server on the first free port of port .. port + count - 1, or None
+    for offset in range(count):
+        try:
+            return ThreadingHTTPServer((addr, port + offset), _MetricsHandler)
+        except OSError:
+            continue
+    return None
+
+
+def start_metrics_server(addr=METRICS_ADDR, port=METRICS_PORT, count=METRICS_PORTS):
+    # Serve /metrics once per process; LITARC_METRICS_PORT="" turns it off.
+    global _server, _server_started
+    with _server_lock:
+        if _server_started or not port:
+            return _server
+        _server_started = True
+        _server = _bind(addr, int(port), count)
+        if _server is None:
+            _log.warning("No free port for /metrics in %s:%s-%s; not serving metrics", addr, port, int(port) + count - 1)
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="litarc-metrics", daemon=True).start()
+    return _server
+
+
+def metrics_url():
+    # Where this process serves /metrics, or None
+    if _server is None:
+        return None
+    host, port = _server.server_address[:2]
+    return f"http://{host}:{port}/metrics"
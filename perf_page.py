@@ -0,0 +1,85 @@
+# perf_page.py
+# Internal "Performance" page: what the corpus pages spend their time on.
+# Only listed in the navigation when LITARC_PERF_PAGE=1.
+import os
+
+import pandas as pd
+import streamlit as st
+
+import corpus_store
+import dracor_client
+import perf
+
+ENABLED = os.environ.get("LITARC_PERF_PAGE", "") == "1"
+
+STAGE_ORDER = [
+    "rerun_total", "metadata_lookup", "stats", "transform", "paginate",
+    "html", "figure", "chart_send", "dracor_request", "csv_parse",
+]
+
+
+def render():
+    st.title("Performance")
+    url = perf.metrics_url()
+    st.caption(
+        f"Recent samples per corpus and stage (last {perf.RESERVOIR}), in milliseconds, for this process."
+        + (f" Prometheus text at {url}" if url else " This process does not serve /metrics.")
+    )
+
+    rows = perf.summary()
+    if not rows:
+        st.info("No corpus page has been rendered by this process yet.")
+    else:
+        df = pd.DataFrame(rows)
+        for col in ["mean", "p50", "p95", "p99"]:
+            df[col] = df[col] * 1000
+        df["stage"] = pd.Categorical(df["stage"], categories=STAGE_ORDER + sorted(set(df["stage"]) - set(STAGE_ORDER)))
+        df = df.sort_values(["corpus", "stage"])
+
+        corpora = sorted(df["corpus"].unique())
+        picked = st.multiselect("Corpora", corpora, default=corpora)
+        st.dataframe(
+            df[df["corpus"].isin(picked)],
+            hide_index=True,
+            column_config={col: st.column_config.NumberColumn(format="%.2f") for col in ["mean", "p50", "p95", "p99"]},
+        )
+
+    st.subheader("Cache lookups")
+    lookups = perf.counters("cache_lookups")
+    if lookups:
+        hits = pd.DataFrame(lookups).pivot_table(
+            index=["cache", "corpus"], columns="result", values="value", aggfunc="sum", fill_value=0
+        )
+        hits["hit rate"] = hits.get("hit", 0) / hits.sum(axis=1)
+        st.dataframe(hits.reset_index(), hide_index=True)
+
+    st.subheader("Metadata memory")
+    cache = corpus_store.cache_stats()
+    st.write(
+        f"{cache['entries']} corpora, {cache['bytes'] / 2**20:.1f} of {cache['budget'] / 2**20:.0f} MiB, "
+        f"{cache['evictions']} evictions."
+    )
+    if cache["sizes"]:
+        sizes = pd.Series(cache["sizes"], name="MiB") / 2**20
+        st.dataframe(sizes.rename_axis("corpus").reset_index(), hide_index=True)
+
+    st.subheader("Background refresh")
+    schedule = corpus_store.refresh_schedule()
+    st.write(f"{len(schedule)} entries scheduled, at most {corpus_store.REFRESH_WORKERS} reloads at a time.")
+    if schedule:
+        st.dataframe(pd.DataFrame(schedule, columns=["entry", "due in (s)"]).round(0), hide_index=True)
+
+    st.subheader("DraCor requests")
+    stats = dracor_client.latency_stats()
+    if stats:
+        st.dataframe(pd.DataFrame.from_dict(stats, orient="index").rename_axis("endpoint").reset_index(), hide_index=True)
+
+    st.subheader("Warm-up")
+    status = corpus_store.warmup_status()
+    if status["started"] is None:
+        st.write("Not started.")
+    else:
+        done = status["finished"] and status["finished"] - status["started"]
+        st.write(f"Finished in {done:.1f} s." if done else "Running…")
+        if status["corpora"]:
+            st.dataframe(pd.DataFrame.from_dict(status["corpora"], orient="index").rename_axis("corpus").reset_index(), hide_index=True)
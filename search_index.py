@@ -0,0 +1,159 @@
+# search_index.py
+# In-memory full-text index over title, subtitle and firstAuthor of every
+# corpus. Words are indexed by trigram (substring and prefix matches) plus
+# their one- and two-letter prefixes for very short queries. Corpora are
+# (re)indexed individually whenever their metadata frame changes.
+import heapq
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+import pandas as pd
+
+FIELDS = ["title", "subtitle", "firstAuthor"]
+# How much a hit in each field counts towards a result's rank
+FIELD_WEIGHTS = {"title": 3, "firstAuthor": 2, "subtitle": 1}
+
+_word = re.compile(r"\w+")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+
+
+def trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def content_version(df):
+    cols = [col for col in FIELDS if col in df.columns]
+    return int(pd.util.hash_pandas_object(df[cols], index=False).sum())
+
+
+def _discard(sets, key, word):
+    # Drop emptied keys so re-indexing a corpus leaves nothing behind
+    words = sets.get(key)
+    if words is not None:
+        words.discard(word)
+        if not words:
+            del sets[key]
+
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._next_id = 0
+        self._docs = {}                      # doc id -> result row
+        self._doc_words = {}                 # doc id -> distinct normalized words
+        self._postings = {}                  # word -> {doc id: field weight}
+        self._grams = defaultdict(set)       # trigram -> words containing it
+        self._prefixes = defaultdict(set)    # 1-2 letter prefix -> words
+        self._corpus_docs = defaultdict(list)
+        self._sources = {}                   # corpus -> (frame, content version)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def corpora(self):
+        return list(self._sources)
+
+    def sync(self, corpus_code, df):
+        # Cheap when nothing changed: the store hands out the same frame
+        # object until a refresh replaces it.
+        source = self._sources.get(corpus_code)
+        if source is not None and source[0] is df:
+            return False
+        version = content_version(df)
+        if source is not None and source[1] == version:
+            self._sources[corpus_code] = (df, version)
+            return False
+        with self._lock:
+            self._remove(corpus_code)
+            self._add(corpus_code, df)
+            self._sources[corpus_code] = (df, version)
+        return True
+
+    def _remove(self, corpus_code):
+        for doc_id in self._corpus_docs.pop(corpus_code, []):
+            for word in self._doc_words.pop(doc_id):
+                docs = self._postings[word]
+                del docs[doc_id]
+                if not docs:
+                    del self._postings[word]
+                    for gram in trigrams(word):
+                        _discard(self._grams, gram, word)
+                    for n in (1, 2):
+                        _discard(self._prefixes, word[:n], word)
+            del self._docs[doc_id]
+
+    def _add(self, corpus_code, df):
+        present = [col for col in FIELDS if col in df.columns]
+        year = df["yearPrinted"] if "yearPrinted" in df.columns else pd.Series(pd.NA, index=df.index)
+        for row, yr in zip(df[present].itertuples(index=False, name=None), year):
+            doc_id = self._next_id
+            self._next_id += 1
+            values = {field: None if pd.isna(value) else value for field, value in zip(present, row)}
+            weights = {}
+            for field, value in values.items():
+                if value is None:
+                    continue
+                for word in _word.findall(normalize(value)):
+                    weights[word] = max(weights.get(word, 0), FIELD_WEIGHTS[field])
+            for word, weight in weights.items():
+                docs = self._postings.get(word)
+                if docs is None:
+                    docs = self._postings[word] = {}
+                    for gram in trigrams(word):
+                        self._grams[gram].add(word)
+                    for n in (1, 2):
+                        self._prefixes[word[:n]].add(word)
+                docs[doc_id] = weight
+            self._doc_words[doc_id] = list(weights)
+            self._docs[doc_id] = {
+                "corpus": corpus_code,
+                "title": values.get("title"),
+                "subtitle": values.get("subtitle"),
+                "author": values.get("firstAuthor"),
+                "year": None if pd.isna(yr) else int(yr),
+            }
+            self._corpus_docs[corpus_code].append(doc_id)
+
+    def _matching_words(self, token):
+        if len(token) < 3:
+            return self._prefixes.get(token, ())
+        postings = sorted((self._grams.get(gram, set()) for gram in trigrams(token)), key=len)
+        return [word for word in set.intersection(*postings) if token in word]
+
+    def _token_scores(self, token):
+        # Best score per document for one query token: a word-prefix hit
+        # counts double, weighted by the field the word appears in.
+        scores = {}
+        for word in self._matching_words(token):
+            bonus = 2 if word.startswith(token) else 1
+            for doc_id, weight in self._postings[word].items():
+                score = bonus * weight
+                if score > scores.get(doc_id, 0):
+                    scores[doc_id] = score
+        return scores
+
+    def search(self, query, limit=50):
+        tokens = _word.findall(normalize(query))
+        if not tokens:
+            return []
+        with self._lock:
+            totals = None
+            for token in sorted(set(tokens), key=len, reverse=True):
+                scores = self._token_scores(token)
+                if totals is None:
+                    totals = scores
+                else:
+                    totals = {doc_id: total + scores[doc_id] for doc_id, total in totals.items() if doc_id in scores}
+                if not totals:
+                    return []
+            best = heapq.nsmallest(limit, totals.items(), key=lambda item: (-item[1], item[0]))
+            return [self._docs[doc_id] for doc_id, _ in best]
+
+
+index = SearchIndex()
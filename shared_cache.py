@@ -0,0 +1,131 @@
+# shared_cache.py
+# Host-wide tier shared by every Streamlit process on the machine: parsed
+# tables are published as Arrow IPC files, swapped in atomically, and a
+# per-key file lock lets one process download and parse while the others
+# wait for its result instead of repeating the work.
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+
+import http_cache
+
+try:
+    import fcntl
+except ImportError:
+    # No flock (Windows): processes no longer coordinate, but each one
+    # still reads whatever another has published.
+    fcntl = None
+
+SHARED_DIR = os.environ.get("LITARC_SHARED_DIR", os.path.join(http_cache.CACHE_DIR, "shared"))
+
+_thread_locks = {}
+_thread_locks_lock = threading.Lock()
+
+
+def path(key):
+    return os.path.join(SHARED_DIR, f"{key}.arrow")
+
+
+def age(key):
+    try:
+        return time.time() - os.path.getmtime(path(key))
+    except OSError:
+        return None
+
+
+def read(key):
+    # Memory-mapped: the table's buffers point into the file, so every process
+    # on the host shares the same pages through the OS page cache.
+    return pa.ipc.open_file(pa.memory_map(path(key), "r")).read_all()
+
+
+def _arrow_dtype(arrow_type):
+    # Dictionary columns stay pandas categoricals (small codes, and the pages
+    # rely on .cat); everything else wraps the mapped buffers without a copy.
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def to_pandas(table):
+    return table.to_pandas(types_mapper=_arrow_dtype)
+
+
+def write(key, table):
+    # Write next to the target and swap it in; readers that mapped the old
+    # file keep its pages until they let go of the table.
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=SHARED_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path(key))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@contextmanager
+def locked(key):
+    # Threads of this process queue on a lock of their own, processes on flock.
+    with _thread_locks_lock:
+        thread_lock = _thread_locks.setdefault(key, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(SHARED_DIR, exist_ok=True)
+        with open(os.path.join(SHARED_DIR, f"{key}.lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _fresh(key, max_age):
+    current = age(key)
+    if current is None or current > max_age:
+        return None
+    try:
+        return read(key)
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def get_or_load(key, load, max_age):
+    # The published table if it is younger than max_age. Otherwise the first
+    # process to take the lock calls load() and publishes the result; the
+    # rest find it published once they get the lock. If load() fails, an
+    # older published table is still better than nothing.
+    table = _fresh(key, max_age)
+    if table is not None:
+        return table
+    with locked(key):
+        table = _fresh(key, max_age)
+        if table is not None:
+            return table
+        try:
+            table = load()
+        except Exception:
+            if age(key) is None:
+                raise
+            return read(key)
+        write(key, table)
+        return table
+
+
+def clear():
+    try:
+        names = os.listdir(SHARED_DIR)
+    except OSError:
+        return
+    for name in names:
+        if name.endswith(".arrow"):
+            os.unlink(os.path.join(SHARED_DIR, name))
@@ -0,0 +1,112 @@
+# snapshot.py
+# Offline snapshot of everything the pages read from DraCor: the corpora
+# metrics index and one Parquet partition of metadata per corpus.
+#
+#   python snapshot.py build
+#
+# writes snapshot/metrics.parquet and snapshot/metadata/corpus=<name>/part-0.parquet
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SNAPSHOT_DIR = os.environ.get(
+    "LITARC_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot")
+)
+
+
+def metrics_path():
+    return os.path.join(SNAPSHOT_DIR, "metrics.parquet")
+
+
+def metadata_path(corpus_code):
+    return os.path.join(SNAPSHOT_DIR, "metadata", f"corpus={corpus_code}", "part-0.parquet")
+
+
+def exists():
+    return os.path.exists(metrics_path())
+
+
+def _write_table(table, path):
+    # Write next to the target and swap it in, so readers never see a partial file.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def metrics_table(index):
+    return pa.table({
+        "name": list(index),
+        "corpus": [json.dumps(c, ensure_ascii=False) for c in index.values()],
+    })
+
+
+def metrics_from_table(table):
+    return {name: json.loads(corpus) for name, corpus in zip(table["name"].to_pylist(), table["corpus"].to_pylist())}
+
+
+def metadata_table(df):
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].astype("string")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_metrics(index):
+    _write_table(metrics_table(index), metrics_path())
+
+
+def read_metrics():
+    return metrics_from_table(pq.read_table(metrics_path()))
+
+
+def write_metadata(corpus_code, df):
+    _write_table(metadata_table(df), metadata_path(corpus_code))
+
+
+def read_metadata(corpus_code):
+    return pq.read_table(metadata_path(corpus_code)).to_pandas()
+
+
+def build(corpus_codes, max_workers=8):
+    import corpus_store
+
+    start = time.perf_counter()
+    index = corpus_store.fetch_metrics_index()
+    write_metrics(index)
+
+    def one(code):
+        write_metadata(code, corpus_store.fetch_metadata(code))
+        return code
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for code in pool.map(one, corpus_codes):
+            print(f"  {code}: {metadata_path(code)}")
+    print(f"Snapshot of {len(corpus_codes)} corpora written to {SNAPSHOT_DIR} in {time.perf_counter() - start:.1f}s")
+
+
+def main(argv=None):
+    from corpus_data import corpus_data
+
+    parser = argparse.ArgumentParser(description="Build the offline DraCor snapshot.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--corpus", action="append", help="only these corpora (default: all in corpus_data)")
+    args = parser.parse_args(argv)
+
+    build(args.corpus or [short for _, short, _ in corpus_data])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# tests/conftest.py
+# Shared fixtures: a local DraCor stand-in (benchmarks/standin.py) serving
+# fixtures from a temporary directory, with the HTTP and shared caches
+# pointed at scratch space (and no snapshot) so every test starts cold.
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dracor_client  # noqa: E402
+import http_cache  # noqa: E402
+import shared_cache  # noqa: E402
+import snapshot  # noqa: E402
+from benchmarks import standin  # noqa: E402
+
+
+@pytest.fixture
+def scratch_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(http_cache, "DB_PATH", str(cache_dir / "http.sqlite"))
+    monkeypatch.setattr(http_cache, "_local", threading.local())
+    monkeypatch.setattr(shared_cache, "SHARED_DIR", str(cache_dir / "shared"))
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", str(tmp_path / "snapshot"))
+    monkeypatch.setattr(dracor_client, "_failed", {})
+    monkeypatch.setattr(dracor_client, "_breakers", {})
+    return cache_dir
+
+
+@pytest.fixture
+def fixture_root(tmp_path):
+    root = tmp_path / "recorded"
+    root.mkdir()
+    return str(root)
+
+
+@pytest.fixture
+def make_standin(fixture_root, scratch_cache, monkeypatch):
+    # make_standin(latency=0.2) -> a running server that dracor_client talks to
+    servers = []
+
+    def make(**knobs):
+        server = standin.start(root=fixture_root, **knobs)
+        servers.append(server)
+        monkeypatch.setattr(dracor_client, "API_BASE", server.api_base)
+        return server
+
+    yield make
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,57 @@
+# tests/test_dracor_client.py
+import time
+
+import pytest
+import requests
+
+import dracor_client
+from benchmarks import fixtures
+
+PATH = fixtures.metadata_path("test")
+
+
+@pytest.fixture(autouse=True)
+def quick_backoff(monkeypatch):
+    monkeypatch.setattr(dracor_client, "BACKOFF", 0.01)
+
+
+def test_hanging_upstream_is_not_retried(make_standin, fixture_root, monkeypatch):
+    fixtures.save(PATH, b"name\nplay\n", fixture_root)
+    monkeypatch.setattr(dracor_client, "READ_TIMEOUT", 0.3)
+    server = make_standin(latency=1.5)
+
+    start = time.perf_counter()
+    with pytest.raises(requests.Timeout):
+        dracor_client.get(PATH)
+    assert time.perf_counter() - start < 1.0
+    assert server.hits[PATH] == 1
+    assert dracor_client.stale_since(PATH) is not None
+
+
+def test_trickling_upstream_is_cut_off_at_the_budget(make_standin, fixture_root, monkeypatch):
+    # Every read returns within READ_TIMEOUT, but the body takes 4 s in all
+    fixtures.save(PATH, b"x" * 200_000, fixture_root)
+    monkeypatch.setattr(dracor_client, "READ_TIMEOUT", 2)
+    monkeypatch.setattr(dracor_client, "LATENCY_BUDGET", 1)
+    make_standin(bandwidth=50_000)
+
+    start = time.perf_counter()
+    with pytest.raises(dracor_client.DeadlineExceeded):
+        dracor_client.get(PATH)
+    assert time.perf_counter() - start < 1.5
+    assert dracor_client.stale_since(PATH) is not None
+
+
+def test_server_error_is_retried_with_backoff(make_standin, fixture_root):
+    fixtures.save(PATH, b"name\nplay\n", fixture_root)
+    server = make_standin(failure_rate=0.5, seed=1)  # 503, then 200
+    assert dracor_client.get(PATH).content == b"name\nplay\n"
+    assert server.hits[PATH] == 2
+    assert dracor_client.stale_since(PATH) is None
+
+
+def test_persistent_server_error_gives_up(make_standin):
+    server = make_standin(failure_rate=1.0)
+    with pytest.raises(requests.HTTPError):
+        dracor_client.get(PATH)
+    assert server.hits[PATH] == dracor_client.RETRIES + 1
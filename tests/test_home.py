@@ -0,0 +1,32 @@
+# tests/test_home.py
+import os
+
+from streamlit.testing.v1 import AppTest
+
+import corpus_store
+import home_cards
+import perf
+import thumbnails
+from corpus_data import corpus_data
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def test_card_grid_is_built_once_across_reruns(monkeypatch):
+    monkeypatch.setattr(corpus_store, "start_warmup", lambda codes: None)
+    monkeypatch.setattr(perf, "start_metrics_server", lambda: None)
+    monkeypatch.setattr(home_cards, "_grids", {})
+    calls = []
+    picture = thumbnails.picture
+
+    def counting_picture(*args, **kwargs):
+        calls.append(args[0])
+        return picture(*args, **kwargs)
+
+    monkeypatch.setattr(thumbnails, "picture", counting_picture)
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    at.run()
+    assert not at.exception
+    assert any("card-grid" in m.value for m in at.markdown)
+    assert len(calls) == len(corpus_data)
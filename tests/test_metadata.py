@@ -0,0 +1,33 @@
+# tests/test_metadata.py
+import corpus_store
+from benchmarks import synth
+
+
+def test_csv_header():
+    assert corpus_store._csv_header(b"\xef\xbb\xbfname,title\r\nx,y\r\n") == ["name", "title"]
+    assert corpus_store._csv_header(b"name,title") == ["name", "title"]
+    assert corpus_store._csv_header(b"") == []
+
+
+def test_non_integer_year_falls_back_to_pandas():
+    df = corpus_store.parse_metadata(b"name,yearPrinted\na,1700\nb,about 1750\n")
+    assert str(df["yearPrinted"].dtype) == "Int16"
+    assert df["yearPrinted"].tolist()[0] == 1700
+    assert df["yearPrinted"].isna().tolist() == [False, True]
+
+
+def test_parse_header_only_body():
+    df = corpus_store.parse_metadata(b"name,firstAuthor,yearPrinted")
+    assert len(df) == 0
+    assert "yearPrinted" in df.columns
+
+
+def test_synthetic_corpus_parses_with_arrow(monkeypatch):
+    def no_fallback(body, columns):
+        raise AssertionError("fell back to the pandas parser")
+
+    monkeypatch.setattr(corpus_store, "_parse_with_pandas", no_fallback)
+    df = corpus_store.parse_metadata(synth.csv_bytes(synth.metadata_frame(500)))
+    assert len(df) == 500
+    assert str(df["yearPrinted"].dtype) == "Int16"
+    assert df["yearPrinted"].isna().any()
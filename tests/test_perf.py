@@ -0,0 +1,28 @@
+# tests/test_perf.py
+import dracor_client
+import perf
+from benchmarks import fixtures
+
+
+def test_prometheus_text_declares_each_metric_once(make_standin, fixture_root):
+    fixtures.save(fixtures.metadata_path("test"), b"name\nplay\n", fixture_root)
+    make_standin()
+    dracor_client.fetch(fixtures.metadata_path("test"))
+    perf.observe("test", "stats", 0.01)
+
+    types = [line.split()[2] for line in perf.prometheus_text().splitlines() if line.startswith("# TYPE ")]
+    assert len(types) == len(set(types))
+    assert "litarc_dracor_corpus_bytes_total" in types
+    assert "litarc_dracor_bytes_total" in types
+
+
+def test_each_worker_binds_its_own_metrics_port():
+    first = perf._bind("127.0.0.1", 0, 1)  # any free port
+    port = first.server_address[1]
+    try:
+        second = perf._bind("127.0.0.1", port, 4)
+        assert port < second.server_address[1] < port + 4
+        second.server_close()
+        assert perf._bind("127.0.0.1", port, 1) is None
+    finally:
+        first.server_close()
@@ -0,0 +1,67 @@
+# tests/test_refresh.py
+import time
+
+import pytest
+import requests
+
+import corpus_store
+import dracor_client
+from benchmarks import fixtures
+
+BODY = b"name,firstAuthor,title,yearPrinted\nplay-one,Author,One,1700\n"
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(dracor_client, "FRESH_FOR", 0)
+    corpus_store.clear()
+    yield corpus_store
+    corpus_store.clear()
+
+
+def test_scheduled_reload_downloads_within_the_ttl(store, make_standin, fixture_root, monkeypatch):
+    # The reload at 80-100% of the TTL must not settle for the file this
+    # process published itself, which is still younger than the TTL.
+    monkeypatch.setattr(store, "METADATA_TTL", 2)
+    path = fixtures.metadata_path("test")
+    fixtures.save(path, BODY, fixture_root)
+    server = make_standin()
+
+    assert len(store.metadata("test")) == 1
+    assert server.hits[path] == 1
+    time.sleep(2.3)
+    assert server.hits[path] == 2
+
+
+def test_age_of_loaded_value_counts_against_ttl():
+    entry = corpus_store.StaleWhileRevalidate(lambda: "old", 10, age=lambda: 11)
+    entry.get()
+    assert entry.state() == "stale"
+    fresh = corpus_store.StaleWhileRevalidate(lambda: "new", 10, age=lambda: 2)
+    fresh.get()
+    assert fresh.state() == "hit"
+
+
+def test_failed_first_load_is_retried_in_the_background(store, make_standin, fixture_root, monkeypatch):
+    # The warm-up's metrics fetch fails; nothing asks again, the page only peeks
+    monkeypatch.setattr(store, "RETRY_AFTER", 0.3)
+    fixtures.save(fixtures.metadata_path("test"), BODY, fixture_root)
+    make_standin()
+    with pytest.raises(requests.HTTPError):
+        store.metrics_index()
+    assert store.cached_metrics("test") is None
+
+    fixtures.save(fixtures.METRICS_PATH, b'[{"name": "test", "metrics": {"sp": 12}}]', fixture_root)
+    time.sleep(0.8)
+    assert store.cached_metrics("test") == {"sp": 12}
+    assert dracor_client.stale_since(fixtures.METRICS_PATH) is None
+
+
+def test_metrics_outage_does_not_flag_the_page_stale(store, make_standin, fixture_root):
+    fixtures.save(fixtures.metadata_path("test"), BODY, fixture_root)
+    make_standin()
+    with pytest.raises(requests.HTTPError):
+        store.metrics_index()
+    store.metadata("test")
+    assert dracor_client.stale_since(fixtures.METRICS_PATH) is not None
+    assert store.stale_since("test") is None
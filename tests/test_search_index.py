@@ -0,0 +1,105 @@
+# tests/test_search_index.py
+import time
+
+import pandas as pd
+
+import corpus_store
+from benchmarks import synth
+from search_index import SearchIndex
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=["title", "subtitle", "firstAuthor", "yearPrinted"])
+
+
+PLAYS = frame([
+    ("Le Misanthrope", "Comédie", "Molière", 1667),
+    ("Faust", "Eine Tragödie", "Goethe, Johann Wolfgang", 1808),
+    ("König Ödipus", None, "Sophokles", None),
+    ("Tartuffe", "ou l'Imposteur", "Molière", 1669),
+])
+
+
+def titles(results):
+    return [r["title"] for r in results]
+
+
+def test_search_by_word_prefix_and_substring():
+    index = SearchIndex()
+    index.sync("test", PLAYS)
+    assert titles(index.search("faust")) == ["Faust"]
+    assert titles(index.search("misan")) == ["Le Misanthrope"]
+    assert titles(index.search("anthro")) == ["Le Misanthrope"]
+    assert titles(index.search("tartuffe imposteur")) == ["Tartuffe"]
+    assert index.search("hamlet") == []
+
+
+def test_short_queries_match_word_prefixes():
+    index = SearchIndex()
+    index.sync("test", PLAYS)
+    assert titles(index.search("fa")) == ["Faust"]
+    assert set(titles(index.search("t"))) == {"Faust", "Tartuffe"}
+
+
+def test_accents_are_folded():
+    index = SearchIndex()
+    index.sync("test", PLAYS)
+    assert set(titles(index.search("moliere"))) == {"Le Misanthrope", "Tartuffe"}
+    assert titles(index.search("ODIPUS")) == ["König Ödipus"]
+    assert titles(index.search("tragödie")) == ["Faust"]
+    assert index.search("koenig") == []
+
+
+def test_title_hits_rank_above_subtitle_hits():
+    index = SearchIndex()
+    index.sync("test", frame([
+        ("A Comedy of Errors", None, "Shakespeare", 1623),
+        ("Volpone", "A Comedy", "Jonson", 1607),
+    ]))
+    assert titles(index.search("comedy")) == ["A Comedy of Errors", "Volpone"]
+
+
+def test_sync_replaces_a_corpus():
+    index = SearchIndex()
+    index.sync("test", PLAYS)
+    index.sync("other", frame([("Faust II", None, "Goethe", 1832)]))
+    assert index.sync("test", PLAYS.copy()) is False  # same content
+
+    assert index.sync("test", frame([("Hamlet", None, "Shakespeare", 1603)])) is True
+    assert len(index) == 2
+    assert titles(index.search("faust")) == ["Faust II"]
+    assert titles(index.search("hamlet")) == ["Hamlet"]
+    assert index.search("moliere") == []
+    # No keys left behind for words that are gone
+    assert all(index._grams.values()) and all(index._prefixes.values())
+    assert "mol" not in index._grams and "mo" not in index._prefixes
+
+
+def test_repeated_refreshes_do_not_grow_the_index():
+    index = SearchIndex()
+    plays = corpus_store.parse_metadata(synth.csv_bytes(synth.metadata_frame(300)))
+    index.sync("synth", plays)
+    sizes = (len(index._grams), len(index._prefixes), len(index._postings))
+    for title in ("Zyxw", "Qvut", "Zyxw"):
+        changed = plays.copy()
+        changed.loc[0, "title"] = title
+        index.sync("synth", changed)
+    index.sync("synth", plays.copy())
+    assert (len(index._grams), len(index._prefixes), len(index._postings)) == sizes
+
+
+def test_search_over_thousands_of_plays_is_fast():
+    index = SearchIndex()
+    for n in range(4):
+        df = corpus_store.parse_metadata(synth.csv_bytes(synth.metadata_frame(1500, seed=n)))
+        index.sync(f"synth{n}", df)
+    assert len(index) == 6000
+    for query in ("love", "ki", "dream wed", "author 1"):
+        best = min(_timed(index.search, query) for _ in range(5))
+        assert best < 0.010, f"{query!r} took {best * 1000:.1f} ms"
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
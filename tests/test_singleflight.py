@@ -0,0 +1,45 @@
+# tests/test_singleflight.py
+import threading
+
+import pytest
+
+import dracor_client
+from benchmarks import fixtures
+from singleflight import SingleFlight
+
+PATH = fixtures.metadata_path("test")
+BODY = b"name,title\nplay-one,One\nplay-two,Two\n"
+
+
+def test_concurrent_fetches_share_one_download(make_standin, fixture_root):
+    fixtures.save(PATH, BODY, fixture_root)
+    server = make_standin(latency=0.3)
+    start = threading.Barrier(16)
+    results = []
+
+    def worker():
+        start.wait()
+        results.append(dracor_client.fetch(PATH).body)
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.hits[PATH] == 1
+    assert results == [BODY] * 16
+
+
+def test_error_is_shared_and_not_cached():
+    flights = SingleFlight()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise ValueError("upstream")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            flights.do("key", fail)
+    assert len(calls) == 2
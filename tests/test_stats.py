@@ -0,0 +1,63 @@
+# tests/test_stats.py
+import json
+import os
+
+import pytest
+
+import corpus_page
+import corpus_store
+from benchmarks import fixtures, stats_check, synth
+
+# Real DraCor responses for small corpora, recorded with
+#   python -m benchmarks.standin record --corpus tat --root tests/recorded
+RECORDED = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recorded")
+
+
+def recorded_corpora():
+    if not fixtures.has(fixtures.METRICS_PATH, RECORDED):
+        return []
+    index = json.loads(fixtures.load(fixtures.METRICS_PATH, RECORDED))
+    return [c["name"] for c in index if fixtures.has(fixtures.metadata_path(c["name"]), RECORDED)]
+
+
+@pytest.mark.skipif(not recorded_corpora(), reason="no recorded DraCor corpus under tests/recorded")
+@pytest.mark.parametrize("code", recorded_corpora() or ["-"])
+def test_stats_match_dracor_metrics(code):
+    # Against DraCor's own figures, not ones derived from the same columns
+    index = {c["name"]: c for c in json.loads(fixtures.load(fixtures.METRICS_PATH, RECORDED))}
+    df = corpus_store.parse_metadata(fixtures.load(fixtures.metadata_path(code), RECORDED))
+    assert stats_check.check(df, index[code].get("metrics", {})) == []
+
+
+def test_stats_sum_the_metadata_columns():
+    df = corpus_store.parse_metadata(
+        b"name,numOfSpeakers,numOfSpeakersMale,numOfSpeakersFemale,wordCountText,wordCountSp,wordCountStage\n"
+        b"a,10,6,4,1000,900,100\n"
+        b"b,5,3,,500,450,50\n"
+    )
+    stats = corpus_page.stats_from_metadata(df, {"sp": 120, "stage": 30})
+    assert stats == {
+        "Plays": 2,
+        "Characters": 15,
+        "Male Characters": 9,
+        "Female Characters": 4,
+        "Spoken Segments": 120,
+        "Stage Directions": 30,
+        "Total Word Count": 3000,
+        "Word Count (Spoken Segments)": 1350,
+        "Word Count (Stage Directions)": 150,
+    }
+
+
+def test_stats_without_metrics_leave_segments_empty():
+    df = corpus_store.parse_metadata(synth.csv_bytes(synth.metadata_frame(10)))
+    stats = corpus_page.stats_from_metadata(df)
+    assert stats["Plays"] == 10
+    assert stats["Spoken Segments"] is None
+
+
+def test_stats_check_runs_through_standin(make_standin, fixture_root):
+    # Plumbing only: the synthetic metrics are built from the same columns
+    synth.write(200, "synth", root=fixture_root)
+    make_standin()
+    assert stats_check.main(["--corpus", "synth"]) == 0
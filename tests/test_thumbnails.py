@@ -0,0 +1,49 @@
+# tests/test_thumbnails.py
+import base64
+import io
+import os
+import re
+
+import pytest
+from PIL import Image
+
+import thumbnails
+
+
+@pytest.fixture
+def built(tmp_path, monkeypatch):
+    thumb_dir = tmp_path / "thumbs"
+    monkeypatch.setattr(thumbnails, "THUMB_DIR", str(thumb_dir))
+    monkeypatch.setattr(thumbnails, "MANIFEST_PATH", str(thumb_dir / "manifest.json"))
+    monkeypatch.setattr(thumbnails, "_manifest_mtime", None)
+    monkeypatch.setattr(thumbnails, "_data_uris", {})
+
+    def download(url):
+        out = io.BytesIO()
+        Image.new("RGB", (1600, 900), "#8b0000").save(out, format="JPEG")
+        return out.getvalue()
+
+    monkeypatch.setattr(thumbnails, "download", download)
+    thumbnails.build({"test": "https://example.org/test.jpg"})
+    return thumb_dir
+
+
+def test_card_webp_is_inlined(built):
+    markup = thumbnails.picture("test", "card", inline=True)
+    webp = thumbnails.manifest()["test"]["card"]["webp"]
+    encoded = re.search(r'srcset="data:image/webp;base64,([^"]+)"', markup).group(1)
+    assert base64.b64decode(encoded) == (built / webp).read_bytes()
+    # The JPEG fallback stays a static URL
+    assert f'src="{thumbnails.STATIC_URL}/thumbs/' in markup
+
+
+def test_banner_is_served_from_static(built):
+    markup = thumbnails.picture("test", "banner")
+    names = re.findall(r"app/static/thumbs/([^\"?]+)", markup)
+    assert len(names) == 2
+    assert all(os.path.exists(built / name) for name in names)
+    assert "data:" not in markup
+
+
+def test_placeholder_without_a_build(built):
+    assert 'src="data:image/svg+xml,' in thumbnails.picture("other", "card", inline=True)
@@ -0,0 +1,238 @@
+# thumbnails.py
+# Local copies of the corpus images: every image in image_urls is downloaded
+# once and resized into a home-card thumbnail and a corpus-page banner, each
+# as WebP and JPEG, under content-hashed names in static/thumbs/. Streamlit
+# serves them from app/static/ (see .streamlit/config.toml), but without
+# Cache-Control and without answering conditional requests with a 304, so
+# the small card WebPs are inlined into the (cached) home page fragment as
+# data: URIs instead of being fetched again on every visit.
+#
+#   python thumbnails.py build
+#
+# Until a corpus has been built its remote image is used as before.
+import argparse
+import base64
+import hashlib
+import html
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+from urllib.parse import quote
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+THUMB_DIR = os.path.join(STATIC_DIR, "thumbs")
+MANIFEST_PATH = os.path.join(THUMB_DIR, "manifest.json")
+SOURCE_DIR = os.environ.get(
+    "LITARC_IMAGE_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "images")
+)
+# How the app addresses static/ (relative, so a server.baseUrlPath still works)
+STATIC_URL = "app/static"
+
+# name -> (width, height); a height of None keeps the aspect ratio.
+# Cards are shown at 100x100 CSS pixels, rendered at 2x for dense screens.
+SIZES = {
+    "card": (200, 200),
+    "banner": (1200, None),
+}
+QUALITY = {"webp": 80, "jpeg": 82}
+
+PLACEHOLDER = "placeholder.svg"
+PLACEHOLDER_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="200" height="200" viewBox="0 0 200 200">
+<rect width="200" height="200" rx="24" fill="#f2f2f2"/>
+<text x="100" y="118" font-family="Georgia, serif" font-size="56" fill="#c0392b" text-anchor="middle">🎭</text>
+</svg>
+"""
+
+_manifest = None
+_manifest_mtime = None
+_manifest_lock = threading.Lock()
+_data_uris = {}  # file name -> data: URI; names are content-hashed
+
+
+def _hashed_name(short, size, data, ext):
+    return f"{short}-{size}-{hashlib.sha1(data).hexdigest()[:12]}.{ext}"
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def download(url):
+    # The original image, fetched once and kept under .cache/images/
+    import requests
+
+    path = os.path.join(SOURCE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest())
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    resp = requests.get(url, timeout=(3.05, 30), headers={"User-Agent": "LitArc"})
+    resp.raise_for_status()
+    _write_atomic(path, resp.content)
+    return resp.content
+
+
+def resize(source, width, height):
+    from PIL import Image, ImageOps
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(source))).convert("RGB")
+    if height is None:
+        height = max(1, round(image.height * min(1, width / image.width)))
+        width = min(width, image.width)
+        return image.resize((width, height), Image.LANCZOS)
+    # Fixed box: scale and centre-crop, like object-fit: cover
+    return ImageOps.fit(image, (width, height), Image.LANCZOS)
+
+
+def encode(image, ext):
+    out = io.BytesIO()
+    image.save(out, format=ext.upper(), quality=QUALITY[ext], optimize=True)
+    return out.getvalue()
+
+
+def build_one(short, url):
+    source = download(url)
+    entry = {}
+    for size, (width, height) in SIZES.items():
+        image = resize(source, width, height)
+        files = {}
+        for ext in QUALITY:
+            data = encode(image, ext)
+            name = _hashed_name(short, size, data, ext)
+            path = os.path.join(THUMB_DIR, name)
+            if not os.path.exists(path):
+                _write_atomic(path, data)
+            files[ext] = name
+        entry[size] = dict(files, width=image.width, height=image.height)
+    return entry
+
+
+def build(image_urls, only=None):
+    from concurrent.futures import ThreadPoolExecutor
+
+    manifest = read_manifest()
+    wanted = {short: url for short, url in image_urls.items() if not only or short in only}
+
+    def one(item):
+        short, url = item
+        try:
+            return short, build_one(short, url), None
+        except Exception as exc:
+            return short, None, exc
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for short, entry, error in pool.map(one, wanted.items()):
+            if error is not None:
+                print(f"  {short}: failed ({error})")
+                continue
+            manifest[short] = entry
+            print(f"  {short}: {entry['card']['webp']}, {entry['banner']['webp']}")
+
+    write_placeholder()
+    # Drop files no longer referenced by the manifest
+    keep = {PLACEHOLDER, os.path.basename(MANIFEST_PATH)}
+    for entry in manifest.values():
+        for files in entry.values():
+            keep.update(files[ext] for ext in QUALITY)
+    for name in os.listdir(THUMB_DIR):
+        if name not in keep:
+            os.unlink(os.path.join(THUMB_DIR, name))
+    _write_atomic(MANIFEST_PATH, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+def write_placeholder():
+    _write_atomic(os.path.join(THUMB_DIR, PLACEHOLDER), PLACEHOLDER_SVG.encode("utf-8"))
+
+
+def read_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def manifest():
+    # Re-read only when a build has replaced the file
+    global _manifest, _manifest_mtime
+    try:
+        mtime = os.path.getmtime(MANIFEST_PATH)
+    except OSError:
+        mtime = None
+    if mtime != _manifest_mtime:
+        with _manifest_lock:
+            _manifest, _manifest_mtime = read_manifest(), mtime
+    return _manifest or {}
+
+
+def version():
+    # Changes whenever a build changes the manifest
+    return _manifest_mtime if manifest() else None
+
+
+def url(name):
+    # Content-hashed, so the file behind a URL never changes
+    return f"{STATIC_URL}/thumbs/{name}"
+
+
+def data_uri(name):
+    uri = _data_uris.get(name)
+    if uri is None:
+        with open(os.path.join(THUMB_DIR, name), "rb") as f:
+            data = base64.b64encode(f.read()).decode("ascii")
+        uri = _data_uris[name] = f"data:image/{name.rsplit('.', 1)[-1]};base64,{data}"
+    return uri
+
+
+def placeholder_url():
+    if os.path.exists(os.path.join(THUMB_DIR, PLACEHOLDER)):
+        return f"{STATIC_URL}/thumbs/{PLACEHOLDER}"
+    return "data:image/svg+xml," + quote(PLACEHOLDER_SVG)
+
+
+def picture(short, size, remote_url=None, css_class="", style="", inline=False):
+    # <picture> with WebP and a JPEG fallback; the remote image until the
+    # corpus has been built, and the local placeholder when there is none.
+    # inline puts the WebP in the markup itself (only the rare browser
+    # without WebP support fetches the JPEG).
+    attrs = f'class="{css_class}" style="{style}" alt="" decoding="async"'
+    files = manifest().get(short, {}).get(size)
+    if files is None:
+        if remote_url:
+            src = html.escape(remote_url)
+        else:
+            src = "data:image/svg+xml," + quote(PLACEHOLDER_SVG) if inline else placeholder_url()
+        return f'<img src="{src}" {attrs}>'
+    webp = data_uri(files["webp"]) if inline else url(files["webp"])
+    return (
+        f'<picture><source srcset="{webp}" type="image/webp">'
+        f'<img src="{url(files["jpeg"])}" width="{files["width"]}" height="{files["height"]}" {attrs}>'
+        f"</picture>"
+    )
+
+
+def main(argv=None):
+    from corpus_data import image_urls
+
+    parser = argparse.ArgumentParser(description="Build local thumbnails of the corpus images.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--corpus", action="append", help="only these corpora (default: all in image_urls)")
+    args = parser.parse_args(argv)
+
+    manifest = build(image_urls, args.corpus)
+    print(f"{len(manifest)} corpora in {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())